@@ -1440,7 +1440,20 @@ function App() {
       const res = await fetch(`${API_BASE}/lora/reindex_all`, { method: "POST" });
       if (!res.ok) throw new Error(`Reindex failed with status ${res.status}`);
 
-      const info = await res.json();
+      const { job_id: jobId } = await res.json();
+      if (!jobId) throw new Error("Reindex did not return a job id.");
+
+      // The rescan runs in the background; wait for its job to finish.
+      let info;
+      for (;;) {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const statusRes = await fetch(`${API_BASE}/lora/reindex_status/${jobId}`);
+        if (!statusRes.ok) throw new Error(`Reindex status failed with status ${statusRes.status}`);
+        info = await statusRes.json();
+        if (info.status !== "running") break;
+      }
+      if (info.status !== "ok") throw new Error(info.error || "Reindex failed – see backend console.");
+
       const s = info.summary || {};
       const summaryText = `Indexed ${s.total ?? 0} LoRAs · With blocks: ${s.with_blocks ?? 0} · No blocks: ${s.no_blocks ?? 0} · ${info.duration_sec ?? 0}s`;
       setLastScanSummary(summaryText);
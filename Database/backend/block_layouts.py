@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Optional
 
 FLUX_FALLBACK_16 = "flux_fallback_16"
@@ -9,64 +10,99 @@ FLUX_UNET_57 = "flux_unet_57"
 FLUX2_TRANSFORMER_56 = "flux2_transformer_56"
 FALLBACK_LAYOUTS = {FLUX_FALLBACK_16, UNET_57, FLUX_UNET_57}
 
-_FLUX_TRANSFORMER_RE = re.compile(r"^flux_transformer_(\d+)$")
-_FLUX_DOUBLE_RE = re.compile(r"^flux_double_(\d+)$")
-_FLUX_TE_RE = re.compile(r"^flux_te_(\d+)$")
-_WAN_UNET_RE = re.compile(r"^wan_unet_(\d+)$")
-_WAN_MODE_UNET_RE = re.compile(r"^wan_([a-z0-9]+)_unet_(\d+)$")
+# Fixed-size layouts and their block counts; one dict lookup answers both
+# "is this a known literal?" and "how many blocks?".
+_STATIC_LAYOUT_COUNTS = {
+    FLUX_FALLBACK_16: 16,
+    UNET_57: 57,
+    FLUX_UNET_57: 57,
+    FLUX2_TRANSFORMER_56: 56,
+}
+_LAYOUT_FOR_BLOCK_COUNT = {
+    57: UNET_57,
+    56: FLUX2_TRANSFORMER_56,
+    16: FLUX_FALLBACK_16,
+}
+_FLUX_DYNAMIC_PREFIXES = ("flux_transformer_", "flux_double_", "flux_te_")
+
+
+# Zero-width lookahead so finditer reports every marker, including ones that
+# overlap (e.g. "double+single_transformer_blocks"), in one pass.
+_LORA_TYPE_MARKER_RE = re.compile(
+    r"(?=(?P<flux2>flux ?2)"
+    r"|(?P<transformer>single_transformer_blocks)"
+    r"|(?P<double_single>double\+single)"
+    r"|(?P<double>double_blocks)"
+    r"|(?P<te>text-encoder))"
+)
+
+
+def _dynamic_layout_count(value: str) -> Optional[int]:
+    """
+    Parse flux_<kind>_<n>, wan_unet_<n> and wan_<mode>_unet_<n> without regex.
+
+    Returns the encoded block count, or None when the name is not a valid
+    dynamic layout.
+    """
+    for prefix in _FLUX_DYNAMIC_PREFIXES:
+        if value.startswith(prefix):
+            suffix = value[len(prefix):]
+            return int(suffix) if suffix.isdecimal() else None
+
+    if value.startswith("wan_"):
+        parts = value.split("_")
+        if len(parts) == 4:
+            mode = parts[1]
+            if not (mode.isascii() and mode.isalnum()):
+                return None
+        elif len(parts) != 3:
+            return None
+        if parts[-2] != "unet" or not parts[-1].isdecimal():
+            return None
+        return int(parts[-1])
+
+    return None
 
 
 def _extract_count(layout: str) -> Optional[int]:
-    if layout == FLUX_FALLBACK_16:
-        return 16
-    if layout == FLUX2_TRANSFORMER_56:
-        return 56
-    if layout in {UNET_57, FLUX_UNET_57}:
-        return 57
-
-    for pattern in (
-        _FLUX_TRANSFORMER_RE,
-        _FLUX_DOUBLE_RE,
-        _FLUX_TE_RE,
-        _WAN_UNET_RE,
-        _WAN_MODE_UNET_RE,
-    ):
-        match = pattern.match(layout)
-        if match:
-            value = match.group(match.lastindex or 1)
-            return int(value)
+    count = _STATIC_LAYOUT_COUNTS.get(layout)
+    if count is not None:
+        return count
+    return _dynamic_layout_count(layout)
 
-    return None
 
+def cheap_lower(value: str) -> str:
+    # Layout strings and safetensors keys are normally lowercase ASCII
+    # already; return them as-is instead of building a new string.
+    return value if value.isascii() and value.islower() else value.lower()
+
+
+# Layout strings come from a small, highly repetitive set (DB rows, API args).
+LAYOUT_CACHE_SIZE = 256
 
-def normalize_block_layout(raw: Optional[str]) -> Optional[str]:
-    if raw is None:
-        return None
 
-    value = str(raw).strip().lower()
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _normalize_layout_str(raw: str) -> Optional[str]:
+    value = cheap_lower(raw.strip())
     if not value:
         return None
 
-    if value in {
-        FLUX_FALLBACK_16,
-        UNET_57,
-        FLUX_UNET_57,
-        FLUX2_TRANSFORMER_56,
-    }:
+    if value in _STATIC_LAYOUT_COUNTS:
         return value
 
-    if (
-        _FLUX_TRANSFORMER_RE.match(value)
-        or _FLUX_DOUBLE_RE.match(value)
-        or _FLUX_TE_RE.match(value)
-        or _WAN_UNET_RE.match(value)
-        or _WAN_MODE_UNET_RE.match(value)
-    ):
+    if _dynamic_layout_count(value) is not None:
         return value
 
     return None
 
 
+def normalize_block_layout(raw: Optional[str]) -> Optional[str]:
+    if raw is None:
+        return None
+    return _normalize_layout_str(str(raw))
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
 def expected_block_count_for_layout(layout: str) -> Optional[int]:
     normalized = normalize_block_layout(layout)
     if normalized is None:
@@ -74,6 +110,7 @@ def expected_block_count_for_layout(layout: str) -> Optional[int]:
     return _extract_count(normalized)
 
 
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
 def fallback_block_count_for_layout(layout: Optional[str]) -> Optional[int]:
     normalized = normalize_block_layout(layout)
     if normalized is None or normalized not in FALLBACK_LAYOUTS:
@@ -82,41 +119,35 @@ def fallback_block_count_for_layout(layout: Optional[str]) -> Optional[int]:
 
 
 def infer_layout_from_block_count(block_count: int) -> Optional[str]:
-    if block_count == 57:
-        return UNET_57
-    if block_count == 56:
-        return FLUX2_TRANSFORMER_56
-    if block_count == 16:
-        return FLUX_FALLBACK_16
-    return None
+    return _LAYOUT_FOR_BLOCK_COUNT.get(block_count)
 
 
+# Keyed on (lora_type, block_count): a library has few distinct inspector
+# labels, so the marker regex runs once per label/count pair.
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
 def make_flux_layout(lora_type: Optional[str], block_count: int) -> Optional[str]:
     if block_count <= 0:
         return None
 
-    lora_type_norm = (lora_type or "").lower()
+    markers = {m.lastgroup for m in _LORA_TYPE_MARKER_RE.finditer(cheap_lower(lora_type or ""))}
 
-    if (
-        "flux 2" in lora_type_norm
-        or "flux2" in lora_type_norm
-    ) and block_count == 56:
+    if "flux2" in markers and block_count == 56:
         return FLUX2_TRANSFORMER_56
 
-    if "single_transformer_blocks" in lora_type_norm:
+    if "transformer" in markers:
         return f"flux_transformer_{block_count}"
 
     # Handle inspector label: "Flux (UNet double+single blocks)"
-    if "unet double+single blocks" in lora_type_norm or "double+single" in lora_type_norm:
+    if "double_single" in markers:
         if block_count == 57:
             return FLUX_UNET_57
         return None
 
     # Handle legacy/double block wording
-    if "unet double_blocks" in lora_type_norm or "double_blocks" in lora_type_norm:
+    if "double" in markers:
         return f"flux_double_{block_count}"
 
-    if "text-encoder" in lora_type_norm:
+    if "te" in markers:
         return f"flux_te_{block_count}"
 
     return None
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from typing import Iterable, Tuple
+import re
+from typing import Callable, Iterable, Tuple
+
+from block_layouts import cheap_lower
+
+try:
+    import ahocorasick  # optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
 
 
 CLIP_KEY_SUBSTRINGS = (
@@ -14,6 +22,36 @@ CLIP_KEY_SUBSTRINGS = (
     "lora_te2",
 )
 
+# Tokens that already contain a shorter token (lora_te1 contains te1, ...) can never
+# change the outcome, so only the minimal ones go into the alternation.
+_CLIP_MINIMAL_TOKENS = tuple(
+    token
+    for token in CLIP_KEY_SUBSTRINGS
+    if not any(other != token and other in token for other in CLIP_KEY_SUBSTRINGS)
+)
+_CLIP_RE = re.compile("|".join(map(re.escape, _CLIP_MINIMAL_TOKENS)))
+
+
+def _build_clip_matcher() -> Callable[[str], bool]:
+    """
+    Return a predicate that is true when a lowercased key contains a clip token.
+
+    Uses a prebuilt Aho-Corasick automaton when pyahocorasick is installed
+    (one linear pass per key, built once at import), otherwise the regex.
+    """
+    if ahocorasick is None:
+        search = _CLIP_RE.search
+        return lambda key_lower: search(key_lower) is not None
+
+    automaton = ahocorasick.Automaton()
+    for token in _CLIP_MINIMAL_TOKENS:
+        automaton.add_word(token, token)
+    automaton.make_automaton()
+    return lambda key_lower: next(automaton.iter(key_lower), None) is not None
+
+
+_has_clip_token = _build_clip_matcher()
+
 
 def is_clip_contributor(keys: Iterable[str]) -> Tuple[bool, int]:
     """
@@ -22,10 +60,6 @@ def is_clip_contributor(keys: Iterable[str]) -> Tuple[bool, int]:
     Returns:
       (clip_contributor, clip_tensor_count)
     """
-    clip_tensor_count = 0
-    for key in keys:
-        key_lower = (key or "").lower()
-        if any(token in key_lower for token in CLIP_KEY_SUBSTRINGS):
-            clip_tensor_count += 1
+    matches = _has_clip_token
+    clip_tensor_count = sum(1 for key in keys if key and matches(cheap_lower(key)))
     return clip_tensor_count > 0, clip_tensor_count
-
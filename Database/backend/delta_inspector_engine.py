@@ -1,7 +1,10 @@
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import torch
 from safetensors import safe_open
@@ -34,16 +37,22 @@ def _normalise_path(path: str) -> str:
     return os.path.abspath(os.path.normpath(path))
 
 
-def _load_safetensors_as_torch(path: str) -> Dict[str, torch.Tensor]:
+def _iter_safetensors(path: str) -> Iterator[Tuple[str, torch.Tensor]]:
     """
-    Load all tensors from a .safetensors file as PyTorch tensors.
+    Yield (key, tensor) pairs from a .safetensors file one at a time.
     Using Torch avoids NumPy's issues with bfloat16.
     """
-    tensors: Dict[str, torch.Tensor] = {}
     with safe_open(path, framework="pt") as f:
         for key in f.keys():
-            tensors[key] = f.get_tensor(key)
-    return tensors
+            yield key, f.get_tensor(key)
+
+
+def _load_safetensors_as_torch(path: str) -> Dict[str, torch.Tensor]:
+    """
+    Load all tensors from a .safetensors file as PyTorch tensors.
+    Prefer `_iter_safetensors` unless every tensor is needed at once.
+    """
+    return dict(_iter_safetensors(path))
 
 
 # --- PATTERNS FOR DIFFERENT FLUX STYLES --- #
@@ -59,28 +68,135 @@ def _load_safetensors_as_torch(path: str) -> Dict[str, torch.Tensor]:
 #    lora_te2_text_model_encoder_layers_<idx>_...
 #
 
-_flux_transformer_pattern = re.compile(
-    r"transformer\.single_transformer_blocks\.(\d+)\.", re.IGNORECASE
+FLUX_DOUBLE_BLOCK_COUNT = 19
+FLUX_SINGLE_BLOCK_COUNT = 38
+
+# One alternation covers all four key styles; the named group that matched
+# identifies the bucket and carries the block index.
+_flux_block_key_pattern = re.compile(
+    r"transformer\.single_transformer_blocks\.(?P<transformer>\d+)\."
+    r"|lora_unet_double_blocks_(?P<double>\d+)_"
+    r"|lora_unet_single_blocks_(?P<single>\d+)_"
+    r"|lora_te[12]_text_model_encoder_layers_(?P<te>\d+)_",
+    re.IGNORECASE,
 )
 
-_flux_double_pattern = re.compile(
-    r"lora_unet_double_blocks_(\d+)_", re.IGNORECASE
-)
 
-_flux_single_pattern = re.compile(
-    r"lora_unet_single_blocks_(\d+)_", re.IGNORECASE
-)
+# Files smaller than this are reduced on CPU: the H2D transfer and CUDA
+# launch overhead outweigh the faster reduction.
+GPU_NORM_MIN_FILE_BYTES = 64 * 1024 * 1024
 
-_flux_te_layer_pattern = re.compile(
-    r"lora_te[12]_text_model_encoder_layers_(\d+)_", re.IGNORECASE
-)
+# Threads used for per-block norm work. Torch releases the GIL inside its
+# kernels, so blocks reduce in parallel. One pool serves every caller, so
+# files inspected concurrently share these threads instead of each starting
+# their own.
+NORM_MAX_WORKERS = os.cpu_count() or 1
+
+_norm_pool: Optional[ThreadPoolExecutor] = None
+_norm_pool_lock = threading.Lock()
+
+
+def _shared_norm_pool() -> ThreadPoolExecutor:
+    global _norm_pool
+    with _norm_pool_lock:
+        if _norm_pool is None:
+            _norm_pool = ThreadPoolExecutor(max_workers=NORM_MAX_WORKERS, thread_name_prefix="lora-norms")
+        return _norm_pool
+
+
+def _norm_device(file_path: str) -> str:
+    """Pick the device that block-strength tensors are loaded onto."""
+    if torch.cuda.is_available() and os.path.getsize(file_path) >= GPU_NORM_MIN_FILE_BYTES:
+        return "cuda"
+    return "cpu"
+
+
+def _norms_for_blocks(
+    file_path: str,
+    device: str,
+    blocks: List[Tuple[int, List[str]]],
+) -> List[Tuple[int, List[torch.Tensor]]]:
+    """
+    Compute per-tensor norms for several blocks through one safe_open handle.
+
+    Tensors are loaded one block at a time and dropped once their norms are
+    issued, so peak memory is a single block per worker. The reduction
+    accumulates and returns float32 directly, so bf16/fp16 LoRA weights are
+    reduced in one pass without an upcast copy and without rounding each norm
+    back to half precision.
+    """
+    results: List[Tuple[int, List[torch.Tensor]]] = []
+    with safe_open(file_path, framework="pt", device=device) as tensor_file:
+        for slot, keys in blocks:
+            tensors = [tensor_file.get_tensor(key) for key in keys]
+            results.append((slot, list(torch._foreach_norm(tensors, 2, dtype=torch.float32))))
+            del tensors
+    return results
+
+
+def _summed_tensor_norms(
+    slots: List[Tuple[int, List[str]]],
+    size: int,
+    file_path: str,
+    device: str,
+) -> torch.Tensor:
+    """
+    Sum per-tensor Frobenius norms into `size` output slots.
+
+    Blocks are spread round-robin over up to NORM_MAX_WORKERS shares, each
+    reduced on the shared norm pool with its own safe_open handle. The norms
+    are scattered into place with a single host sync (one D2H copy when
+    running on CUDA). Accumulation is done in float64 to match the previous
+    Python-float sums.
+    """
+    work = [(slot, keys) for slot, keys in slots if keys]
+    workers = max(1, min(NORM_MAX_WORKERS, len(work)))
+    shares = [work[i::workers] for i in range(workers)]
+
+    if workers == 1:
+        per_worker = [_norms_for_blocks(file_path, device, work)]
+    else:
+        per_worker = list(
+            _shared_norm_pool().map(lambda share: _norms_for_blocks(file_path, device, share), shares)
+        )
+
+    norms: List[torch.Tensor] = []
+    owner_slots: List[int] = []
+    for results in per_worker:
+        for slot, block_norms in results:
+            norms.extend(block_norms)
+            owner_slots.extend([slot] * len(block_norms))
+
+    raw = torch.zeros(size, dtype=torch.float64)
+    if norms:
+        raw.scatter_add_(
+            0,
+            torch.tensor(owner_slots, dtype=torch.long),
+            torch.stack(norms).to(device="cpu", dtype=torch.float64),
+        )
+    return raw
+
+
+def _normalise_strengths(raw: torch.Tensor) -> Tuple[List[float], List[float]]:
+    """
+    Return (raw, normalised) strength lists, scaled so the strongest block is
+    1.0 and rounded to 6 decimals in one vector op.
+    """
+    max_val = raw.max() if raw.numel() else None
+    if max_val is not None and max_val > 0:
+        norm = torch.round(raw / max_val, decimals=6)
+    else:
+        norm = torch.zeros_like(raw)
+    return raw.tolist(), norm.tolist()
 
 
 def _accumulate_block_strengths(
-    blocks: Dict[int, List[torch.Tensor]]
+    blocks: Dict[int, List[str]],
+    file_path: str,
+    device: str,
 ) -> Tuple[List[int], List[float], List[float]]:
     """
-    Given a mapping: block_index -> list of tensors,
+    Given a mapping: block_index -> list of tensor keys,
     compute raw and normalised strengths.
     Returns:
         indices (sorted),
@@ -91,48 +207,41 @@ def _accumulate_block_strengths(
         return [], [], []
 
     indices = sorted(blocks.keys())
-    raw_strengths: List[float] = []
-
-    for idx in indices:
-        strength = 0.0
-        for t in blocks[idx]:
-            strength += float(t.norm().item())
-        raw_strengths.append(strength)
-
-    max_val = max(raw_strengths) if raw_strengths else 0.0
-    if max_val > 0:
-        norm_strengths = [round(v / max_val, 6) for v in raw_strengths]
-    else:
-        norm_strengths = [0.0 for _ in raw_strengths]
+    raw = _summed_tensor_norms(
+        [(pos, blocks[idx]) for pos, idx in enumerate(indices)],
+        len(indices),
+        file_path,
+        device,
+    )
+    raw_strengths, norm_strengths = _normalise_strengths(raw)
 
     return indices, raw_strengths, norm_strengths
 
 
 def _compute_flux_unet_57_strengths(
-    double_blocks: Dict[int, List[torch.Tensor]],
-    single_blocks: Dict[int, List[torch.Tensor]],
+    double_blocks: Dict[int, List[str]],
+    single_blocks: Dict[int, List[str]],
+    file_path: str,
+    device: str,
 ) -> Tuple[List[float], List[float]]:
     """
     Compute ordered [DOUBLE_0..18] + [SINGLE_0..37] raw and normalised strengths.
     Missing indices are represented as 0.0.
     """
-    raw_strengths: List[float] = []
-
-    for idx in range(19):
-        tensors = double_blocks.get(idx, [])
-        raw_strengths.append(sum(float(t.norm().item()) for t in tensors))
-
-    for idx in range(38):
-        tensors = single_blocks.get(idx, [])
-        raw_strengths.append(sum(float(t.norm().item()) for t in tensors))
-
-    max_val = max(raw_strengths) if raw_strengths else 0.0
-    if max_val > 0:
-        norm_strengths = [round(v / max_val, 6) for v in raw_strengths]
-    else:
-        norm_strengths = [0.0 for _ in raw_strengths]
-
-    return raw_strengths, norm_strengths
+    # Only populated blocks are visited; absent ones stay 0.0 in the fixed
+    # 57-slot output, and out-of-range indices are ignored as before.
+    slots = [
+        (idx, keys) for idx, keys in double_blocks.items() if idx < FLUX_DOUBLE_BLOCK_COUNT
+    ]
+    slots.extend(
+        (FLUX_DOUBLE_BLOCK_COUNT + idx, keys)
+        for idx, keys in single_blocks.items()
+        if idx < FLUX_SINGLE_BLOCK_COUNT
+    )
+    raw = _summed_tensor_norms(
+        slots, FLUX_DOUBLE_BLOCK_COUNT + FLUX_SINGLE_BLOCK_COUNT, file_path, device
+    )
+    return _normalise_strengths(raw)
 
 
 # --- FLUX BLOCK ANALYSIS --- #
@@ -154,46 +263,37 @@ def _analyse_flux_blocks(path: str, base_model_code: Optional[str]) -> LoraAnaly
        lora_te2_text_model_encoder_layers_<idx>_...
     """
     file_path = _normalise_path(path)
-    tensors = _load_safetensors_as_torch(file_path)
-
-    transformer_blocks: Dict[int, List[torch.Tensor]] = {}
-    double_blocks: Dict[int, List[torch.Tensor]] = {}
-    single_blocks: Dict[int, List[torch.Tensor]] = {}
-    te_blocks: Dict[int, List[torch.Tensor]] = {}
-
-    # --- Scan all tensors once and bucket them --- #
-    for name, arr in tensors.items():
-        # 1) transformer.single_transformer_blocks.<idx>.*
-        m = _flux_transformer_pattern.search(name)
-        if m:
-            idx = int(m.group(1))
-            transformer_blocks.setdefault(idx, []).append(arr)
-            continue
-
-        # 2) lora_unet_double_blocks_<idx>_...
-        m = _flux_double_pattern.search(name)
-        if m:
-            idx = int(m.group(1))
-            double_blocks.setdefault(idx, []).append(arr)
-            continue
-
-        # 2b) lora_unet_single_blocks_<idx>_...
-        m = _flux_single_pattern.search(name)
-        if m:
-            idx = int(m.group(1))
-            single_blocks.setdefault(idx, []).append(arr)
-            continue
-
-        # 3) lora_te[1 or 2]_text_model_encoder_layers_<idx>_...
-        m = _flux_te_layer_pattern.search(name)
-        if m:
-            idx = int(m.group(1))
-            te_blocks.setdefault(idx, []).append(arr)
-            continue
+
+    transformer_blocks: Dict[int, List[str]] = {}
+    double_blocks: Dict[int, List[str]] = {}
+    single_blocks: Dict[int, List[str]] = {}
+    te_blocks: Dict[int, List[str]] = {}
+
+    with safe_open(file_path, framework="pt") as tensor_file:
+        # --- Scan key names once and bucket them (no tensor data read) --- #
+        # Method references are bound to locals so the loop body avoids
+        # global/attribute lookups per key.
+        search = _flux_block_key_pattern.search
+        bucket_setdefault = {
+            "transformer": transformer_blocks.setdefault,
+            "double": double_blocks.setdefault,
+            "single": single_blocks.setdefault,
+            "te": te_blocks.setdefault,
+        }
+        for name in tensor_file.keys():
+            m = search(name)
+            if m is None:
+                continue
+            kind = m.lastgroup
+            bucket_setdefault[kind](int(m.group(kind)), []).append(name)
+
+    device = _norm_device(file_path)
 
     # --- Case 1: Transformer-style Flux LoRA --- #
     if transformer_blocks:
-        indices, raw_strengths, norm_strengths = _accumulate_block_strengths(transformer_blocks)
+        indices, raw_strengths, norm_strengths = _accumulate_block_strengths(
+            transformer_blocks, file_path, device
+        )
 
         notes = (
             f"Flux transformer blocks detected at indices: {indices}. "
@@ -217,6 +317,8 @@ def _analyse_flux_blocks(path: str, base_model_code: Optional[str]) -> LoraAnaly
         raw_strengths, norm_strengths = _compute_flux_unet_57_strengths(
             double_blocks=double_blocks,
             single_blocks=single_blocks,
+            file_path=file_path,
+            device=device,
         )
 
         notes_parts = [
@@ -244,7 +346,9 @@ def _analyse_flux_blocks(path: str, base_model_code: Optional[str]) -> LoraAnaly
 
     # --- Case 2: UNet double_blocks Flux LoRA --- #
     if double_blocks:
-        indices, raw_strengths, norm_strengths = _accumulate_block_strengths(double_blocks)
+        indices, raw_strengths, norm_strengths = _accumulate_block_strengths(
+            double_blocks, file_path, device
+        )
 
         notes_parts = [
             f"Flux UNet double_blocks detected at indices: {indices}. "
@@ -272,7 +376,9 @@ def _analyse_flux_blocks(path: str, base_model_code: Optional[str]) -> LoraAnaly
 
     # --- Case 3: TE-only Flux LoRA --- #
     if te_blocks:
-        indices, raw_strengths, norm_strengths = _accumulate_block_strengths(te_blocks)
+        indices, raw_strengths, norm_strengths = _accumulate_block_strengths(
+            te_blocks, file_path, device
+        )
 
         notes = (
             "Flux text-encoder-only LoRA detected. "
@@ -323,28 +429,25 @@ def _analyse_unet57_blocks(path: str, base_model_code: Optional[str]) -> LoraAna
 
 # --- PUBLIC ENTRY POINT --- #
 
-def inspect_lora(path: str, base_model_code: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Inspect a LoRA .safetensors file and return a dictionary of analysis results.
+INSPECT_CACHE_SIZE = 1024
 
-    For now, only Flux / Flux Krea (FLX / FLK) are supported for block analysis.
-    Other base_model_code values will raise NotImplementedError.
 
-    Returns a plain dict so it’s easy to JSON-serialise or store in a DB.
+@lru_cache(maxsize=INSPECT_CACHE_SIZE)
+def _inspect_cached(
+    file_path: str,
+    mtime_ns: int,
+    size: int,
+    code_upper: str,
+) -> LoraAnalysis:
     """
-    if not os.path.isfile(path):
-        raise FileNotFoundError(f"No such file: {path}")
-
-    code_upper = (base_model_code or "").upper()
+    Run the analysis for one (file, stat signature, base code) combination.
 
-    if code_upper in ("FLX", "FLK", ""):
-        try:
-            analysis = _analyse_flux_blocks(path, base_model_code=code_upper or None)
-        except ValueError:
-            analysis = _analyse_unet57_blocks(path, base_model_code=code_upper or None)
-    elif code_upper in ("W21", "W22"):
-        analysis = LoraAnalysis(
-            file_path=_normalise_path(path),
+    mtime_ns/size are part of the cache key only: a rewritten file gets a new
+    signature and is analysed again. Callers must not mutate the result.
+    """
+    if code_upper in ("W21", "W22"):
+        return LoraAnalysis(
+            file_path=file_path,
             model_family="WAN",
             base_model_code=code_upper,
             lora_type="WAN (unimplemented)",
@@ -357,11 +460,39 @@ def inspect_lora(path: str, base_model_code: Optional[str] = None) -> Dict[str,
                 "This placeholder preserves metadata safely for indexing/API responses."
             ),
         )
-    else:
+
+    try:
+        return _analyse_flux_blocks(file_path, base_model_code=code_upper or None)
+    except ValueError:
+        return _analyse_unet57_blocks(file_path, base_model_code=code_upper or None)
+
+
+def inspect_lora(path: str, base_model_code: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Inspect a LoRA .safetensors file and return a dictionary of analysis results.
+
+    For now, only Flux / Flux Krea (FLX / FLK) are supported for block analysis.
+    Other base_model_code values will raise NotImplementedError.
+
+    Results are memoised per (absolute path, mtime, size), so re-inspecting an
+    unchanged file costs one os.stat().
+
+    Returns a plain dict so it’s easy to JSON-serialise or store in a DB.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No such file: {path}")
+
+    code_upper = (base_model_code or "").upper()
+
+    if code_upper not in ("FLX", "FLK", "", "W21", "W22"):
         raise NotImplementedError(
             f"Block analysis for base_model_code='{base_model_code}' is not implemented yet. "
             "Currently supported: FLX, FLK (Flux)."
         )
+
+    file_path = _normalise_path(path)
+    stat = os.stat(file_path)
+    analysis = _inspect_cached(file_path, stat.st_mtime_ns, stat.st_size, code_upper)
     return asdict(analysis)
 
 # --- SIMPLE CLI TEST HARNESS --- #
@@ -5,6 +5,23 @@ import torch
 from safetensors import safe_open
 
 
+# safetensors header dtype codes -> the torch dtype a loaded tensor would have.
+_SAFETENSORS_DTYPES: Dict[str, torch.dtype] = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "F8_E4M3": torch.float8_e4m3fn,
+    "F8_E5M2": torch.float8_e5m2,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
 def normalise_path(path: str) -> str:
     return os.path.abspath(os.path.normpath(path))
 
@@ -12,7 +29,7 @@ def normalise_path(path: str) -> str:
 def list_keys(path: str) -> Dict[str, str]:
     """
     Return a dict of {key_name: str(dtype_shape)} for a safetensors file.
-    Uses Torch backend so it can handle bfloat16.
+    Only the JSON header is read (via get_slice); no tensor data is loaded.
     """
     path = normalise_path(path)
 
@@ -23,8 +40,10 @@ def list_keys(path: str) -> Dict[str, str]:
 
     with safe_open(path, framework="pt") as f:
         for key in f.keys():
-            t = f.get_tensor(key)
-            info[key] = f"{str(t.dtype)} {tuple(t.shape)}"
+            tensor_slice = f.get_slice(key)
+            dtype_code = tensor_slice.get_dtype()
+            dtype = _SAFETENSORS_DTYPES.get(dtype_code, dtype_code)
+            info[key] = f"{str(dtype)} {tuple(tensor_slice.get_shape())}"
 
     return info
 
@@ -1,28 +1,44 @@
 from __future__ import annotations
 
-import csv
-import io
+import hashlib
 import json
+import queue
 import sqlite3
+import stat
+import sys
 import threading
 import time
+import uuid
 
 import os
-from datetime import datetime, timezone
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import closing, contextmanager
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query, Body
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Query, Body
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:
+    orjson = None
+
 from delta_inspector_engine import inspect_lora  # optional helper
-from lora_indexer import main as index_all_loras
+from lora_indexer import INSPECT_WORKERS, main as index_all_loras
 from lora_id_assigner import main as assign_stable_ids
 from block_layouts import (
     FLUX_FALLBACK_16,
+    LAYOUT_CACHE_SIZE,
     expected_block_count_for_layout,
     fallback_block_count_for_layout,
     infer_layout_from_block_count,
@@ -69,9 +85,43 @@ REQUIRED_LORA_BLOCK_WEIGHTS_COLUMNS = {
     "stable_id": "TEXT",
 }
 
+# Indexes backing the hot read paths (stable_id lookups, search filters +
+# ORDER BY filename, per-LoRA block fetches, per-LoRA profile lists). An index
+# is skipped when a legacy DB lacks one of its columns.
+# name -> (table, columns, partial-index (column, condition) or None)
+REQUIRED_INDEXES = {
+    "idx_lora_stable_id": ("lora", ("stable_id",), None),
+    "idx_lora_filename": ("lora", ("filename",), None),
+    "idx_lora_base_cat_filename": ("lora", ("base_model_code", "category_code", "filename"), None),
+    # /api/lora/search with only a base filter, still returned in filename order.
+    "idx_lora_base_filename": ("lora", ("base_model_code", "filename"), None),
+    # ...and with only a category filter (base = ALL).
+    "idx_lora_cat_filename": ("lora", ("category_code", "filename"), None),
+    # /api/lora/search?has_blocks=1: walks only LoRAs with weights, already sorted.
+    "idx_lora_blocks_filename": ("lora", ("filename",), ("has_block_weights", "= 1")),
+    "idx_lbw_lora_idx": ("lora_block_weights", ("lora_id", "block_index"), None),
+    "idx_lbw_stable_idx": ("lora_block_weights", ("stable_id", "block_index"), None),
+    "idx_profiles_stable_created": ("lora_user_profiles", ("stable_id", "created_at"), None),
+}
+
+
+# Columns returned by /api/lora/{stable_id} (in table order, when present).
+_DETAIL_COLUMNS = frozenset((
+    "id", "stable_id", "filename", "file_path",
+    "base_model_name", "base_model_code", "category_name", "category_code",
+    "model_family", "lora_type", "rank",
+    "has_block_weights", "block_layout", "clip_contributor", "clip_tensor_count",
+    "last_modified", "created_at", "updated_at",
+))
 
 _schema_migrations_lock = threading.Lock()
 _schema_migrations_done = False
+# `lora` columns in table order, recorded once the migrations have run.
+_lora_columns: Tuple[str, ...] = ()
+# Whether lora_fts (see _ensure_lora_fts) exists and is usable on this DB.
+_lora_fts_ready = False
+# Whether lora_generation (see _ensure_lora_generation) is maintained on this DB.
+_lora_generation_ready = False
 
 
 def ensure_safe_schema_migrations(conn: sqlite3.Connection) -> None:
@@ -82,7 +132,7 @@ def ensure_safe_schema_migrations(conn: sqlite3.Connection) -> None:
     queries may reference it. We add the column if missing so startup/requests do
     not crash on legacy databases.
     """
-    global _schema_migrations_done
+    global _schema_migrations_done, _lora_columns, _lora_fts_ready, _lora_generation_ready
 
     if _schema_migrations_done:
         return
@@ -132,6 +182,18 @@ def ensure_safe_schema_migrations(conn: sqlite3.Connection) -> None:
                 else:
                     raise
 
+        # Writers store base_model_code upper-cased and search binds
+        # base.upper(); fold legacy mixed-case rows so the equality filter and
+        # its indexes match them too. Checked first so read-only DBs still open.
+        if "base_model_code" in columns and cur.execute(
+            "SELECT 1 FROM lora WHERE base_model_code <> UPPER(base_model_code) LIMIT 1;"
+        ).fetchone():
+            cur.execute(
+                "UPDATE lora SET base_model_code = UPPER(base_model_code) "
+                "WHERE base_model_code <> UPPER(base_model_code);"
+            )
+            conn.commit()
+
         # Ensure lora_user_profiles table exists (Phase 5.1)
         cur.execute(
             """
@@ -167,25 +229,272 @@ def ensure_safe_schema_migrations(conn: sqlite3.Connection) -> None:
             );
             """
         )
+
+        cur.execute("PRAGMA table_info(lora_user_profiles)")
+        table_columns = {
+            "lora": columns,
+            "lora_block_weights": bw_columns,
+            "lora_user_profiles": {row[1] for row in cur.fetchall()},
+        }
+        for index_name, (table_name, index_columns, where) in REQUIRED_INDEXES.items():
+            needed = set(index_columns) | ({where[0]} if where else set())
+            if not needed <= table_columns[table_name]:
+                continue
+            where_sql = f" WHERE {where[0]} {where[1]}" if where else ""
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(index_columns)}){where_sql};"
+            )
+        _lora_fts_ready = _ensure_lora_fts(cur)
+        _lora_generation_ready = _ensure_lora_generation(cur)
         conn.commit()
 
+        cur.execute("PRAGMA table_info(lora)")
+        _lora_columns = tuple(row[1] for row in cur.fetchall())
+
         _schema_migrations_done = True
 
 
-def get_db_connection() -> sqlite3.Connection:
+_LORA_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS lora_fts_ai AFTER INSERT ON lora BEGIN
+        INSERT INTO lora_fts(rowid, filename) VALUES (new.id, new.filename);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lora_fts_ad AFTER DELETE ON lora BEGIN
+        INSERT INTO lora_fts(lora_fts, rowid, filename) VALUES ('delete', old.id, old.filename);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lora_fts_au AFTER UPDATE OF id, filename ON lora BEGIN
+        INSERT INTO lora_fts(lora_fts, rowid, filename) VALUES ('delete', old.id, old.filename);
+        INSERT INTO lora_fts(rowid, filename) VALUES (new.id, new.filename);
+    END;
+    """,
+)
+
+
+def _ensure_lora_fts(cur: sqlite3.Cursor) -> bool:
+    """
+    Maintain lora_fts, a trigram FTS5 index over lora.filename.
+
+    The trigram tokenizer answers `LIKE '%needle%'` from the index instead of
+    scanning every filename. Triggers keep it in step with writes from the
+    indexer scripts. Returns False when this SQLite build has no FTS5/trigram
+    support (< 3.34) or the DB is read-only; search then scans lora directly.
+    """
+    try:
+        exists = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lora_fts';"
+        ).fetchone()
+        cur.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS lora_fts USING fts5(
+                filename, content='lora', content_rowid='id', tokenize='trigram'
+            );
+            """
+        )
+        for trigger_sql in _LORA_FTS_TRIGGERS:
+            cur.execute(trigger_sql)
+        if exists is None:
+            # Index the rows that predate the table (and its triggers).
+            cur.execute("INSERT INTO lora_fts(lora_fts) VALUES ('rebuild');")
+        cur.execute("SELECT 1 FROM lora_fts LIMIT 0;")
+    except sqlite3.OperationalError as exc:
+        print(f"[schema] lora_fts unavailable, filename search will scan lora: {exc}")
+        return False
+    return True
+
+
+_LORA_GENERATION_TRIGGERS = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS lora_generation_{suffix} AFTER {event} ON lora BEGIN
+        UPDATE lora_generation SET generation = generation + 1 WHERE id = 0;
+    END;
     """
-    Open a SQLite connection with Row factory enabled.
+    for suffix, event in (("ai", "INSERT"), ("ad", "DELETE"), ("au", "UPDATE"))
+)
+
+
+def _ensure_lora_generation(cur: sqlite3.Cursor) -> bool:
+    """
+    Maintain lora_generation, a single counter bumped by every write to lora.
 
-    We open a fresh connection per request â€“ totally fine for your usage.
+    /api/lora/search derives its ETag from it. Not every writer touches
+    lora.updated_at (e.g. the block_layout backfill), and MAX(updated_at)
+    would miss deletes, so triggers count the writes instead. Returns False
+    when the counter cannot be set up (read-only DB); search then sends no
+    ETag.
     """
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    try:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lora_generation (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                generation INTEGER NOT NULL
+            );
+            """
+        )
+        cur.execute("INSERT OR IGNORE INTO lora_generation (id, generation) VALUES (0, 0);")
+        for trigger_sql in _LORA_GENERATION_TRIGGERS:
+            cur.execute(trigger_sql)
+    except sqlite3.OperationalError as exc:
+        print(f"[schema] lora_generation unavailable, search responses get no ETag: {exc}")
+        return False
+    return True
+
+
+# Idle connections kept for reuse. Requests beyond this many in flight still
+# get a connection; the surplus is simply closed instead of being pooled.
+DB_POOL_SIZE = max(1, int(os.environ.get("LORA_DB_POOL_SIZE", "8")))
+
+# sqlite3 caches prepared statements per connection, keyed by SQL text; pooled
+# connections keep that cache, so size it for every distinct query we issue.
+DB_CACHED_STATEMENTS = 256
+
+# Applied once per physical connection. The page cache and mmap window stay
+# warm for as long as the connection lives in the pool. WAL lets readers run
+# alongside the reindex writers; busy_timeout makes writers wait instead of
+# failing with "database is locked".
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA wal_autocheckpoint=1000;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-64000;",
+    "PRAGMA mmap_size=268435456;",
+)
+DB_BUSY_TIMEOUT_MS = 5000
+
+_pool_lock = threading.Lock()
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_pool_db_path: Optional[str] = None
+# Connections currently borrowed (pooled or opened on demand); under _pool_lock.
+_pool_in_use = 0
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=DB_CACHED_STATEMENTS)
     conn.row_factory = sqlite3.Row
-    ensure_safe_schema_migrations(conn)
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS};")
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+    except sqlite3.OperationalError:
+        # Another process can hold the lock while it flips the mode itself
+        # (or the file is read-only); the DB stays usable in its current mode.
+        pass
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    if not _schema_migrations_done:
+        # Normally already done by on_startup_backfills; scripts that use the
+        # pool without the app (reindex_unet57.py) migrate on first connect.
+        ensure_safe_schema_migrations(conn)
     return conn
 
 
-def row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
-    return {k: row[k] for k in row.keys()}
+def _drain_pool() -> None:
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def _acquire_connection() -> Tuple[sqlite3.Connection, str]:
+    global _pool_db_path, _pool_in_use
+
+    db_path = str(DB_PATH)
+    with _pool_lock:
+        # DB_PATH can be re-pointed after import (Docker wrapper, tests);
+        # connections to the old file must never be handed out again.
+        if _pool_db_path != db_path:
+            _drain_pool()
+            _pool_db_path = db_path
+        try:
+            conn = _pool.get_nowait()
+            _pool_in_use += 1
+            return conn, db_path
+        except queue.Empty:
+            pass
+    conn = _open_connection(db_path)
+    with _pool_lock:
+        _pool_in_use += 1
+    return conn, db_path
+
+
+def _release_connection(conn: sqlite3.Connection, db_path: str) -> None:
+    global _pool_in_use
+
+    with _pool_lock:
+        _pool_in_use -= 1
+    _return_connection(conn, db_path)
+
+
+def _return_connection(conn: sqlite3.Connection, db_path: str) -> None:
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.Error:
+        conn.close()
+        return
+
+    with _pool_lock:
+        if db_path == _pool_db_path:
+            try:
+                _pool.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
+    conn.close()
+
+
+def _warm_pool() -> int:
+    """Fill the pool up to DB_POOL_SIZE so early concurrent requests skip connect()."""
+    db_path = str(DB_PATH)
+    opened = []
+    try:
+        while len(opened) + _pool.qsize() < DB_POOL_SIZE:
+            opened.append(_open_connection(db_path))
+    finally:
+        for conn in opened:
+            _return_connection(conn, db_path)
+    return len(opened)
+
+
+def pool_stats() -> Dict[str, int]:
+    with _pool_lock:
+        return {"size": DB_POOL_SIZE, "idle": _pool.qsize(), "in_use": _pool_in_use}
+
+
+@contextmanager
+def get_db_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled SQLite connection (Row factory enabled).
+
+    Usage: `with get_db_connection() as conn: ...`. The connection goes back
+    to the pool on exit; any transaction left open is rolled back first.
+    """
+    conn, db_path = _acquire_connection()
+    try:
+        yield conn
+    finally:
+        _release_connection(conn, db_path)
+
+
+@contextmanager
+def _api_db_connection() -> Iterator[sqlite3.Connection]:
+    """get_db_connection() for request handlers: open failures become HTTP 500."""
+    try:
+        conn, db_path = _acquire_connection()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
+    try:
+        yield conn
+    finally:
+        _release_connection(conn, db_path)
 
 
 def derive_role_from_path(file_path: str) -> str:
@@ -210,8 +519,14 @@ def derive_role_from_path(file_path: str) -> str:
     return "other"
 
 
+def _utc_now_seconds() -> str:
+    """Current UTC time as YYYY-MM-DDTHH:MM:SS, without building a datetime."""
+    t = time.gmtime()
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return _utc_now_seconds() + "Z"
 
 
 # --- Index status tracking (Phase 5.1: rescan progress) ---
@@ -222,6 +537,18 @@ _index_status: Dict[str, Any] = {
     "total_loras": 0,
     "with_blocks": 0,
     "duration_last_scan_sec": None,
+    # Bulk UNet 57 reindex (background task). Replaced wholesale on every
+    # update, never mutated, so dict(_index_status) is a safe snapshot.
+    "unet57_reindex": {
+        "running": False,
+        "candidates": 0,
+        "processed": 0,
+        "failed": 0,
+        "failures": [],
+        "started_at": None,
+        "finished_at": None,
+        "error": None,
+    },
 }
 
 
@@ -233,6 +560,8 @@ def _should_force_flux_fallback_layout(base_model_code: Optional[str], has_block
     """
     For Flux/Flux-Krea where has_block_weights is false, we always want
     a stable layout for the UI (16 neutral blocks).
+
+    base_model_code is taken as stored; case is normalised here, once.
     """
     if has_blocks:
         return False
@@ -246,16 +575,28 @@ def validate_block_layout_for_search_row(row: Dict[str, Any]) -> Tuple[Optional[
 
     We do NOT mutate the DB here. We only ensure the response is consistent.
     """
-    warnings: List[str] = []
+    layout, warnings = _classify_search_row_layout(
+        row.get("base_model_code"),
+        bool(row.get("has_block_weights")),
+        row.get("block_layout"),
+    )
+    return layout, list(warnings)
+
 
-    base_code = (row.get("base_model_code") or "").upper() or None
-    has_blocks = bool(row.get("has_block_weights"))
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _classify_search_row_layout(
+    base_model_code: Optional[str],
+    has_blocks: bool,
+    raw_layout: Any,
+) -> Tuple[Optional[str], Tuple[str, ...]]:
+    # A search page only holds a handful of distinct (base, has_blocks, layout)
+    # combinations, so each decision is made once and reused for every row.
+    warnings: List[str] = []
 
-    raw_layout = row.get("block_layout")
     layout = normalize_block_layout(raw_layout)
 
     # If Flux/FLK and no blocks, force the UI-friendly fallback layout
-    if _should_force_flux_fallback_layout(base_code, has_blocks):
+    if _should_force_flux_fallback_layout(base_model_code, has_blocks):
         if layout != FLUX_FALLBACK_16:
             if layout is None and raw_layout:
                 warnings.append(f"Invalid block_layout '{raw_layout}' normalized to fallback.")
@@ -265,7 +606,7 @@ def validate_block_layout_for_search_row(row: Dict[str, Any]) -> Tuple[Optional[
     if raw_layout and layout is None:
         warnings.append(f"Invalid block_layout '{raw_layout}' normalized to null.")
 
-    return layout, warnings
+    return layout, tuple(warnings)
 
 
 def validate_blocks_response(
@@ -277,10 +618,15 @@ def validate_blocks_response(
     block_layout: Optional[str],
     blocks: List[Dict[str, Any]],
     fallback: bool,
+    pre_sorted: bool = False,
 ) -> Tuple[Optional[str], List[Dict[str, Any]], List[str]]:
     """
     Validate/normalize block_layout + blocks list for /api/lora/{stable_id}/blocks.
 
+    Pass pre_sorted=True when `blocks` already has integer block_index values
+    in ascending order (e.g. read with ORDER BY block_index); the re-sort is
+    then skipped.
+
     Returns:
       (final_block_layout, final_blocks, warnings)
 
@@ -292,18 +638,20 @@ def validate_blocks_response(
     """
     warnings: List[str] = []
 
-    base_code = (base_model_code or "").upper() or None
     layout = normalize_block_layout(block_layout)
     if block_layout and layout is None:
         warnings.append(f"Invalid block_layout '{block_layout}' normalized to null.")
 
     # Enforce Flux fallback layout for the "no blocks" case
-    if _should_force_flux_fallback_layout(base_code, has_blocks):
+    if _should_force_flux_fallback_layout(base_model_code, has_blocks):
         if layout != FLUX_FALLBACK_16:
             layout = FLUX_FALLBACK_16
 
+    if not blocks:
+        return layout, blocks, warnings
+
     # If we have blocks but no layout, try infer
-    if not fallback and blocks and layout is None:
+    if not fallback and layout is None:
         inferred = infer_layout_from_block_count(len(blocks))
         if inferred:
             layout = inferred
@@ -313,15 +661,34 @@ def validate_blocks_response(
             )
 
     # If we have a layout and blocks, validate count
-    if blocks and layout:
+    if layout:
         expected = expected_block_count_for_layout(layout)
         if expected is not None and len(blocks) != expected:
             warnings.append(
                 f"block_layout '{layout}' expects {expected} blocks but response has {len(blocks)}."
             )
 
+    # Fallback blocks are generated server-side (indices 0..n-1, weight 1.0):
+    # already sorted, contiguous and in range, so the shape checks cannot warn.
+    if fallback:
+        return layout, blocks, warnings
+
     # Validate basic shape of blocks payload (indices, weights)
-    if blocks:
+    if pre_sorted:
+        blocks_sorted = blocks
+        prev_index = blocks[0]["block_index"] - 1
+        for b in blocks:
+            if b["block_index"] != prev_index + 1:
+                warnings.append("block_index values are not contiguous; UI may display gaps.")
+                break
+            prev_index += 1
+    elif all(type(b.get("block_index")) is int for b in blocks):
+        # Integer indices (rows straight from SQLite): nothing below can raise.
+        blocks_sorted = sorted(blocks, key=itemgetter("block_index"))
+        first_index = blocks_sorted[0]["block_index"]
+        if [b["block_index"] for b in blocks_sorted] != list(range(first_index, first_index + len(blocks))):
+            warnings.append("block_index values are not contiguous; UI may display gaps.")
+    else:
         # Ensure sorted by block_index for UI stability
         try:
             blocks_sorted = sorted(blocks, key=lambda b: int(b.get("block_index") or 0))
@@ -340,9 +707,15 @@ def validate_blocks_response(
         except Exception:
             warnings.append("Could not validate block_index contiguity (non-integer indices).")
 
-        # Validate weight range (non-fatal)
-        for b in blocks_sorted:
-            w = b.get("weight")
+    # Validate weight range (non-fatal)
+    weights = [b.get("weight") for b in blocks_sorted]
+    if all(type(w) is float for w in weights):
+        # Float weights (rows straight from SQLite, which stores no NaN): the
+        # C-level min/max replace the per-element float()/compare loop.
+        if min(weights) < 0.0 or max(weights) > 1.0:
+            warnings.append("One or more block weights fall outside [0,1].")
+    else:
+        for w in weights:
             if w is None:
                 continue
             try:
@@ -354,9 +727,7 @@ def validate_blocks_response(
                 warnings.append("One or more block weights are non-numeric.")
                 break
 
-        blocks = blocks_sorted
-
-    return layout, blocks, warnings
+    return layout, blocks_sorted, warnings
 
 
 # ----------------------------------------------------------------------
@@ -381,52 +752,99 @@ def get_index_summary() -> dict:
     }
 
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
+        with get_db_connection() as conn:
+            # All four counts in one pass over the table.
+            row = conn.execute(
+                """
+                SELECT
+                    COUNT(1),
+                    SUM(has_block_weights = 1),
+                    SUM(has_block_weights = 0),
+                    COUNT(stable_id)
+                FROM lora
+                """
+            ).fetchone()
+            summary["total"] = int(row[0] or 0)
+            summary["with_blocks"] = int(row[1] or 0)
+            summary["no_blocks"] = int(row[2] or 0)
+            summary["with_stable_id"] = int(row[3] or 0)
 
-        # Total LoRAs
-        cur.execute("SELECT COUNT(1) FROM lora")
-        summary["total"] = int(cur.fetchone()[0] or 0)
+    except Exception as e:
+        print(f"[index_summary] ERROR: {e}")
 
-        # With block weights
-        cur.execute("SELECT COUNT(1) FROM lora WHERE has_block_weights = 1")
-        summary["with_blocks"] = int(cur.fetchone()[0] or 0)
+    return summary
 
-        # Without block weights
-        cur.execute("SELECT COUNT(1) FROM lora WHERE has_block_weights = 0")
-        summary["no_blocks"] = int(cur.fetchone()[0] or 0)
 
-        # With stable_id
-        cur.execute("SELECT COUNT(1) FROM lora WHERE stable_id IS NOT NULL")
-        summary["with_stable_id"] = int(cur.fetchone()[0] or 0)
 
-    except Exception as e:
-        print(f"[index_summary] ERROR: {e}")
-    finally:
-        try:
-            cur.close()
-            conn.close()
-        except Exception:
-            pass
 
-    return summary
+# Keeps `IN (...)` lists well below SQLite's bound-parameter limit.
+SQL_IN_CHUNK_SIZE = 500
 
 
+def _block_counts_by_lora_id(cur: sqlite3.Cursor, lora_ids: List[int]) -> Dict[int, int]:
+    counts: Dict[int, int] = {}
+    for start in range(0, len(lora_ids), SQL_IN_CHUNK_SIZE):
+        chunk = lora_ids[start:start + SQL_IN_CHUNK_SIZE]
+        cur.execute(
+            f"""
+            SELECT lora_id, COUNT(1) AS cnt
+            FROM lora_block_weights
+            WHERE lora_id IN ({",".join("?" for _ in chunk)})
+            GROUP BY lora_id;
+            """,
+            chunk,
+        )
+        counts.update((row["lora_id"], int(row["cnt"] or 0)) for row in cur.fetchall())
+    return counts
 
 
 def _backfill_flux_layouts(conn: sqlite3.Connection) -> int:
     """Ensure Flux rows always have a normalized block_layout."""
     cur = conn.cursor()
+    # Read and write in one transaction: an indexer committing between the
+    # SELECTs and the UPDATE would otherwise be overwritten with layouts
+    # computed from its stale rows (under WAL the UPDATE fails instead).
+    # Deferred, so a read-only DB with nothing to fix still passes.
+    cur.execute("BEGIN")
+    try:
+        pending = _pending_flux_layout_updates(cur)
+        if pending:
+            # One prepared statement for every row, one commit for the backfill.
+            cur.executemany("UPDATE lora SET block_layout = ? WHERE id = ?", pending)
+        cur.execute("COMMIT")
+    except BaseException:
+        cur.execute("ROLLBACK")
+        raise
+
+    return len(pending)
+
+
+def _pending_flux_layout_updates(cur: sqlite3.Cursor) -> List[Tuple[Optional[str], int]]:
+    """(new_layout, lora_id) for every Flux row whose stored block_layout needs fixing."""
+    # Block-less rows that already carry the fallback layout can never change,
+    # so they are not even fetched.
     cur.execute(
         """
         SELECT id, base_model_code, has_block_weights, lora_type, block_layout
         FROM lora
-        WHERE UPPER(COALESCE(base_model_code, '')) IN ('FLX', 'FLK');
+        WHERE UPPER(COALESCE(base_model_code, '')) IN ('FLX', 'FLK')
+          AND NOT (COALESCE(has_block_weights, 0) = 0 AND block_layout IS 'flux_fallback_16');
         """
     )
     rows = cur.fetchall()
 
-    updates = 0
+    # Rows with blocks but no usable layout get their layout from the stored
+    # block count; fetch all of those counts in one grouped query.
+    block_counts = _block_counts_by_lora_id(
+        cur,
+        [
+            row["id"]
+            for row in rows
+            if row["has_block_weights"] and normalize_block_layout(row["block_layout"]) is None
+        ],
+    )
+
+    pending: List[Tuple[Optional[str], int]] = []
     for row in rows:
         lora_id = row["id"]
         has_blocks = bool(row["has_block_weights"])
@@ -438,8 +856,7 @@ def _backfill_flux_layouts(conn: sqlite3.Connection) -> int:
         if not has_blocks:
             new_layout = FLUX_FALLBACK_16
         elif current_layout is None:
-            cur.execute("SELECT COUNT(1) AS cnt FROM lora_block_weights WHERE lora_id = ?", (lora_id,))
-            count = int(cur.fetchone()["cnt"] or 0)
+            count = block_counts.get(lora_id, 0)
             if count > 0:
                 new_layout = normalize_block_layout(make_flux_layout(row["lora_type"], count))
                 if new_layout is None:
@@ -448,49 +865,87 @@ def _backfill_flux_layouts(conn: sqlite3.Connection) -> int:
                     new_layout = infer_layout_from_block_count(count)
 
         if new_layout != raw_layout:
-            cur.execute("UPDATE lora SET block_layout = ? WHERE id = ?", (new_layout, lora_id))
-            updates += 1
+            pending.append((new_layout, lora_id))
+
+    return pending
+
+
+# SQL form of the UNet 57 candidate rule: the stored layout normalises to
+# unet_57 / flux_unet_57 (normalize_block_layout strips and lowercases), or
+# lora_type mentions both "unet" and "57".
+_UNET57_CANDIDATE_SQL = """
+    SELECT id, stable_id, file_path, base_model_code, lora_type, block_layout
+    FROM lora
+    WHERE stable_id IS NOT NULL
+      AND (
+        LOWER(TRIM(block_layout, ' ' || char(9, 10, 11, 12, 13))) IN ('unet_57', 'flux_unet_57')
+        OR (
+          instr(LOWER(COALESCE(lora_type, '')), 'unet') > 0
+          AND instr(COALESCE(lora_type, ''), '57') > 0
+        )
+      )
+    ORDER BY id ASC
+    LIMIT ?
+"""
 
-    if updates:
-        conn.commit()
 
-    return updates
+def _select_unet57_candidates(conn: sqlite3.Connection, limit: int = 0) -> List[sqlite3.Row]:
+    """
+    Rows that qualify for UNet 57 extraction, filtered by SQLite rather than in Python.
 
+    limit <= 0 means no limit (bound as SQLite's LIMIT -1).
+    """
+    return conn.execute(_UNET57_CANDIDATE_SQL, (limit if limit > 0 else -1,)).fetchall()
 
-def _is_unet57_candidate_row(row: sqlite3.Row) -> bool:
-    layout = normalize_block_layout(row["block_layout"])
-    if layout in ("unet_57", "flux_unet_57"):
-        return True
-    lora_type = (row["lora_type"] or "").lower()
-    return "unet" in lora_type and "57" in lora_type
 
+def _analyse_lora_file(row: sqlite3.Row) -> Tuple[Dict[str, Any], Optional[str], float]:
+    """
+    Inspect a LoRA's file: (analysis, block_layout, mtime).
 
-def _persist_analysis_for_lora(conn: sqlite3.Connection, row: sqlite3.Row) -> Dict[str, Any]:
-    lora_id = row["id"]
-    stable_id = row["stable_id"]
+    Touches no database state, so bulk reindexes run it on worker threads.
+    """
     file_path = row["file_path"]
     base_model_code = (row["base_model_code"] or "").upper() or None
 
-    if not file_path or not os.path.isfile(file_path):
+    # One stat answers both "is it a file?" and the mtime we store.
+    try:
+        st = os.stat(file_path) if file_path else None
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise FileNotFoundError(f"LoRA file not found on disk: {file_path}")
 
     analysis = inspect_lora(file_path, base_model_code=base_model_code)
     block_weights = analysis.get("block_weights") or []
-    raw_strengths = analysis.get("raw_block_strengths") or []
-    has_blocks = bool(block_weights)
 
-    if not has_blocks:
+    if not block_weights:
         block_layout = FLUX_FALLBACK_16 if (base_model_code or "") in ("FLX", "FLK") else None
     else:
         block_layout = normalize_block_layout(make_flux_layout(analysis.get("lora_type"), len(block_weights)))
         if block_layout is None:
             block_layout = infer_layout_from_block_count(len(block_weights))
 
-    now_iso = datetime.utcnow().isoformat(timespec="seconds")
-    mtime = os.path.getmtime(file_path)
+    return analysis, block_layout, st.st_mtime
+
+
+def _write_analysis(
+    conn: sqlite3.Connection,
+    row: sqlite3.Row,
+    analysed: Tuple[Dict[str, Any], Optional[str], float],
+) -> Dict[str, Any]:
+    analysis, block_layout, mtime = analysed
+    lora_id = row["id"]
+    stable_id = row["stable_id"]
+    block_weights = analysis.get("block_weights") or []
+    raw_strengths = analysis.get("raw_block_strengths") or []
+    has_blocks = bool(block_weights)
+
+    now_iso = _utc_now_seconds()
     cur = conn.cursor()
 
-    cur.execute("BEGIN")
+    # A savepoint rather than BEGIN: standalone it is its own transaction, and
+    # inside _persist_analyses' batch transaction it undoes just this LoRA.
+    cur.execute("SAVEPOINT persist_analysis")
     try:
         cur.execute(
             """
@@ -519,18 +974,21 @@ def _persist_analysis_for_lora(conn: sqlite3.Connection, row: sqlite3.Row) -> Di
 
         cur.execute("DELETE FROM lora_block_weights WHERE lora_id = ?", (lora_id,))
         if has_blocks:
-            for idx, (w, r) in enumerate(zip(block_weights, raw_strengths)):
-                cur.execute(
-                    """
-                    INSERT INTO lora_block_weights
-                    (lora_id, stable_id, block_index, weight, raw_strength)
-                    VALUES (?, ?, ?, ?, ?);
-                    """,
-                    (lora_id, stable_id, idx, float(w), float(r) if r is not None else None),
-                )
-        cur.execute("COMMIT")
+            cur.executemany(
+                """
+                INSERT INTO lora_block_weights
+                (lora_id, stable_id, block_index, weight, raw_strength)
+                VALUES (?, ?, ?, ?, ?);
+                """,
+                [
+                    (lora_id, stable_id, idx, float(w), float(r) if r is not None else None)
+                    for idx, (w, r) in enumerate(zip(block_weights, raw_strengths))
+                ],
+            )
+        cur.execute("RELEASE SAVEPOINT persist_analysis")
     except Exception:
-        cur.execute("ROLLBACK")
+        cur.execute("ROLLBACK TO SAVEPOINT persist_analysis")
+        cur.execute("RELEASE SAVEPOINT persist_analysis")
         raise
 
     return {
@@ -541,36 +999,138 @@ def _persist_analysis_for_lora(conn: sqlite3.Connection, row: sqlite3.Row) -> Di
     }
 
 
+def _persist_analysis_for_lora(conn: sqlite3.Connection, row: sqlite3.Row) -> Dict[str, Any]:
+    return _write_analysis(conn, row, _analyse_lora_file(row))
+
+
+# Bulk reindex commits after this many LoRAs: one fsync per batch, while
+# finished work is kept and other writers get the lock back between batches.
+PERSIST_COMMIT_EVERY = 200
+
+
+def _persist_analyses(
+    conn: sqlite3.Connection,
+    rows: List[sqlite3.Row],
+    on_batch: Optional[Callable[[int, List[Tuple[sqlite3.Row, Exception]]], None]] = None,
+) -> Tuple[int, List[Tuple[sqlite3.Row, Exception]]]:
+    """
+    Re-analyse and persist rows in write transactions of PERSIST_COMMIT_EVERY.
+
+    Files are inspected on INSPECT_WORKERS threads before each batch's
+    transaction opens, so the write lock is only held for the writes.
+    A failing LoRA only rolls back its own savepoint; it is reported in the
+    returned failures and the rest of its batch is still committed.
+    on_batch(processed, failures) is called after every commit.
+    """
+    processed = 0
+    failures: List[Tuple[sqlite3.Row, Exception]] = []
+    cur = conn.cursor()
+    with ThreadPoolExecutor(max_workers=INSPECT_WORKERS) as pool:
+        for start in range(0, len(rows), PERSIST_COMMIT_EVERY):
+            batch = rows[start:start + PERSIST_COMMIT_EVERY]
+            futures = [pool.submit(_analyse_lora_file, row) for row in batch]
+            wait(futures)
+
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                for row, future in zip(batch, futures):
+                    try:
+                        _write_analysis(conn, row, future.result())
+                        processed += 1
+                    except Exception as exc:
+                        failures.append((row, exc))
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            if on_batch is not None:
+                on_batch(processed, failures)
+    return processed, failures
+
+
 def on_startup_backfills() -> None:
-    conn: Optional[sqlite3.Connection] = None
+    # One-shot startup work, before any request is served: schema migrations,
+    # then the Flux layout backfill, then pool warm-up.
     try:
-        conn = get_db_connection()
-        updated = _backfill_flux_layouts(conn)
+        with get_db_connection() as conn:
+            ensure_safe_schema_migrations(conn)
+            updated = _backfill_flux_layouts(conn)
         if updated:
             print(f"[startup] Backfilled normalized Flux block_layout for {updated} row(s).")
     except Exception as exc:
         print(f"[startup] block_layout backfill skipped due to error: {exc}")
-    finally:
+
+    # Independent of the backfill: a concurrent indexer commit can make the
+    # backfill fail, and the pool should still start warm.
+    try:
+        _warm_pool()
+    except sqlite3.Error as exc:
+        print(f"[startup] connection pool warm-up skipped: {exc}")
+
+# The WAL is checkpointed automatically (wal_autocheckpoint), but a steady
+# stream of readers can keep it from ever being reset, so the file only grows.
+# A periodic TRUNCATE checkpoint brings it back to zero bytes.
+WAL_CHECKPOINT_INTERVAL_SEC = float(os.environ.get("LORA_WAL_CHECKPOINT_SEC", "300"))
+
+_wal_checkpoint_stop = threading.Event()
+_wal_checkpoint_thread: Optional[threading.Thread] = None
+
+
+def _wal_checkpoint_loop() -> None:
+    while not _wal_checkpoint_stop.wait(WAL_CHECKPOINT_INTERVAL_SEC):
         try:
-            if conn is not None:
-                conn.close()
-        except Exception:
-            pass
+            with get_db_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchall()
+        except sqlite3.Error as exc:
+            print(f"[wal_checkpoint] skipped: {exc}")
+
+
+def start_wal_checkpoints() -> None:
+    global _wal_checkpoint_thread
+    if WAL_CHECKPOINT_INTERVAL_SEC <= 0 or _wal_checkpoint_thread is not None:
+        return
+    _wal_checkpoint_stop.clear()
+    _wal_checkpoint_thread = threading.Thread(target=_wal_checkpoint_loop, name="wal-checkpoint", daemon=True)
+    _wal_checkpoint_thread.start()
+
+
+def stop_wal_checkpoints() -> None:
+    global _wal_checkpoint_thread
+    if _wal_checkpoint_thread is None:
+        return
+    _wal_checkpoint_stop.set()
+    _wal_checkpoint_thread.join()
+    _wal_checkpoint_thread = None
+
+
+# orjson renders large payloads (search pages, combine results) several times
+# faster than the stdlib encoder; fall back to it when orjson is not installed.
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
 
 app = FastAPI(
     title="LoRA Master API",
     version="0.2",
     description="Backend API for LoRA Master (DB-backed).",
+    default_response_class=FastJSONResponse,
 )
 
 app.add_event_handler("startup", on_startup_backfills)
+app.add_event_handler("startup", start_wal_checkpoints)
+app.add_event_handler("shutdown", stop_wal_checkpoints)
+
+# Deployments serve the UI and /api from one origin (nginx / Vite proxy); CORS
+# only matters when a dev UI calls the API directly. The regex is compiled
+# once; no cookies are used, so credentials stay off.
+CORS_ORIGIN_REGEX = os.environ.get(
+    "LORA_CORS_ORIGIN_REGEX", r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$"
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # local dev â€“ you can tighten this later
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origin_regex=CORS_ORIGIN_REGEX,
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["content-type", "if-none-match"],
 )
 
 
@@ -587,6 +1147,10 @@ class LoRACombineRequest(BaseModel):
     per_lora: Dict[str, LoRACombineSettings] = Field(default_factory=dict)
 
 
+class LoRABlocksBatchRequest(BaseModel):
+    stable_ids: List[str] = Field(default_factory=list)
+
+
 class CombinedProfileSaveRequest(BaseModel):
     profile_name: str
     recipe: Dict[str, Any]
@@ -809,20 +1373,26 @@ def _build_node_payloads(
 
 
 
-@app.post("/api/lora/reindex_all")
-async def api_reindex_all():
-    """
-    Full rescan + reindex of ALL LoRA files.
+# Finished and running /api/lora/reindex_all jobs, oldest first. Guarded by
+# _index_status_lock; entries are replaced wholesale, never mutated.
+REINDEX_JOBS_KEPT = 20
+_reindex_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_reindex_running_job: Optional[str] = None
 
-    - Runs the filesystem indexer (lora_indexer.main via index_all_loras)
-    - Then assigns/refreshes stable IDs (lora_id_assigner.main)
-    - Returns a small summary for the UI to display.
-    """
+
+def _set_reindex_job(job_id: str, **changes: Any) -> None:
     with _index_status_lock:
-        if _index_status["indexing"]:
-            return {"status": "already_running", "message": "Indexing is already in progress."}
-        _index_status["indexing"] = True
+        _reindex_jobs[job_id] = {**_reindex_jobs[job_id], **changes}
+
+
+def _run_full_reindex(job_id: str) -> None:
+    """
+    Background body of /api/lora/reindex_all (filesystem walk + DB writes).
 
+    Owns the _index_status transitions and the job's final state; the caller
+    has already set indexing=True and registered the job.
+    """
+    global _reindex_running_job
     start = time.time()
 
     try:
@@ -832,27 +1402,72 @@ async def api_reindex_all():
         # 2) Ensure stable_id column exists and is filled/updated
         assign_stable_ids()
 
+        # Refresh planner statistics now that the table may have grown a lot.
+        with get_db_connection() as conn:
+            conn.execute("ANALYZE lora;")
+            conn.commit()
+
         duration = round(time.time() - start, 1)
 
         # 3) Build a quick DB summary for the UI
         summary = get_index_summary()
-
+        # Entries from before the rescan can no longer match; free them now.
+        clear_search_cache()
+    except Exception as exc:
+        print(f"[reindex_all] ERROR: {exc}")
         with _index_status_lock:
             _index_status["indexing"] = False
-            _index_status["last_scan"] = _now_iso()
-            _index_status["total_loras"] = summary.get("total", 0)
-            _index_status["with_blocks"] = summary.get("with_blocks", 0)
-            _index_status["duration_last_scan_sec"] = duration
+            _reindex_running_job = None
+        _set_reindex_job(job_id, status="error", finished_at=_now_iso(), error=str(exc))
+        return
 
-        return {
-            "status": "ok",
-            "duration_sec": duration,
-            "summary": summary,
+    with _index_status_lock:
+        _index_status["indexing"] = False
+        _index_status["last_scan"] = _now_iso()
+        _index_status["total_loras"] = summary.get("total", 0)
+        _index_status["with_blocks"] = summary.get("with_blocks", 0)
+        _index_status["duration_last_scan_sec"] = duration
+        _reindex_running_job = None
+    _set_reindex_job(job_id, status="ok", finished_at=_now_iso(), duration_sec=duration, summary=summary)
+
+
+@app.post("/api/lora/reindex_all", status_code=202)
+async def api_reindex_all(background_tasks: BackgroundTasks):
+    """
+    Queue a full rescan + reindex of ALL LoRA files.
+
+    - Runs the filesystem indexer (lora_indexer.main via index_all_loras)
+    - Then assigns/refreshes stable IDs (lora_id_assigner.main)
+
+    Returns a job_id immediately; poll /api/lora/reindex_status/{job_id} for
+    the outcome ("running", then "ok" with the summary, or "error").
+    """
+    global _reindex_running_job
+    with _index_status_lock:
+        if _index_status["indexing"]:
+            return {
+                "status": "already_running",
+                "message": "Indexing is already in progress.",
+                "job_id": _reindex_running_job,
+            }
+        _index_status["indexing"] = True
+
+        job_id = uuid.uuid4().hex
+        _reindex_running_job = job_id
+        _reindex_jobs[job_id] = {
+            "job_id": job_id,
+            "status": "running",
+            "started_at": _now_iso(),
+            "finished_at": None,
+            "duration_sec": None,
+            "summary": None,
+            "error": None,
         }
-    except Exception:
-        with _index_status_lock:
-            _index_status["indexing"] = False
-        raise
+        while len(_reindex_jobs) > REINDEX_JOBS_KEPT:
+            _reindex_jobs.popitem(last=False)
+
+    background_tasks.add_task(_run_full_reindex, job_id)
+    return {"status": "queued", "job_id": job_id}
 
 
 # ----------------------------------------------------------------------
@@ -864,20 +1479,8 @@ def health():
     """
     Basic health check + a quick DB summary.
     """
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) AS cnt FROM lora;")
-        total = cur.fetchone()["cnt"]
-
-        cur.execute(
-            "SELECT COUNT(*) AS cnt FROM lora WHERE stable_id IS NOT NULL;"
-        )
-        with_id = cur.fetchone()["cnt"]
+    with _api_db_connection() as conn:
+        total, with_id = conn.execute("SELECT COUNT(*), COUNT(stable_id) FROM lora;").fetchone()
 
         return {
             "status": "ok",
@@ -885,8 +1488,13 @@ def health():
             "total_loras": total,
             "with_stable_id": with_id,
         }
-    finally:
-        conn.close()
+
+
+
+@app.get("/pool-health")
+def pool_health():
+    """SQLite connection pool usage: configured size, idle and borrowed connections."""
+    return pool_stats()
 
 
 
@@ -898,220 +1506,225 @@ def api_lora_combine(body: LoRACombineRequest):
 
     deduped_stable_ids = list(dict.fromkeys(stable_ids))
 
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
-        placeholders = ",".join("?" for _ in deduped_stable_ids)
-        cur = conn.cursor()
-        cur.execute("PRAGMA table_info(lora)")
-        lora_columns = {row[1] for row in cur.fetchall()}
-        has_file_path_column = "file_path" in lora_columns
-        file_path_select = "file_path" if has_file_path_column else "NULL AS file_path"
-        cur.execute(
-            f"""
-            SELECT id, stable_id, filename, {file_path_select}, base_model_code, block_layout, has_block_weights
-                   , clip_contributor
-            FROM lora
-            WHERE stable_id IN ({placeholders});
-            """,
-            deduped_stable_ids,
-        )
-        lora_rows = cur.fetchall()
-
-        rows_by_sid = {row["stable_id"]: row for row in lora_rows}
-        missing_ids = [sid for sid in deduped_stable_ids if sid not in rows_by_sid]
-
-        excluded_loras: List[Dict[str, Any]] = []
-        warnings: List[str] = []
-        included_loras: List[LoRAComposeInput] = []
-        fallback_excluded_ids: List[str] = []
-
-        for stable_id in deduped_stable_ids:
-            if stable_id in missing_ids:
-                excluded_loras.append(
-                    _make_excluded_lora_entry(
-                        stable_id=stable_id,
-                        filename=None,
-                        role=None,
-                        reason_code="missing_lora",
-                        reason_detail="Excluded because the requested LoRA was not found.",
-                    )
-                )
-                warnings.append(f"LoRA {stable_id} was not found and was excluded from combination.")
-                continue
-
-            row = rows_by_sid[stable_id]
+    with _api_db_connection() as conn:
+        try:
+            placeholders = ",".join("?" for _ in deduped_stable_ids)
+            cur = conn.cursor()
+            cur.execute("PRAGMA table_info(lora)")
+            lora_columns = {row[1] for row in cur.fetchall()}
+            has_file_path_column = "file_path" in lora_columns
+            file_path_select = "file_path" if has_file_path_column else "NULL AS file_path"
             cur.execute(
-                """
-                SELECT block_index, weight
-                FROM lora_block_weights
-                WHERE stable_id = ?
-                ORDER BY block_index ASC;
+                f"""
+                SELECT id, stable_id, filename, {file_path_select}, base_model_code, block_layout, has_block_weights
+                       , clip_contributor
+                FROM lora
+                WHERE stable_id IN ({placeholders});
                 """,
-                (stable_id,),
+                deduped_stable_ids,
             )
-            bw_rows = cur.fetchall()
-            has_rows = len(bw_rows) > 0
-            has_flag = bool(row["has_block_weights"])
-
-            if not has_rows:
-                fallback_excluded_ids.append(stable_id)
-                excluded_loras.append(
-                    _make_excluded_lora_entry(
+            lora_rows = cur.fetchall()
+
+            rows_by_sid = {row["stable_id"]: row for row in lora_rows}
+            missing_ids = [sid for sid in deduped_stable_ids if sid not in rows_by_sid]
+
+            # One query for every found LoRA's weights instead of one per stable_id.
+            weights_by_sid: Dict[str, List[float]] = {}
+            found_ids = [sid for sid in deduped_stable_ids if sid in rows_by_sid]
+            if found_ids:
+                # Plain tuples: no sqlite3.Row per weight, no per-key lookups.
+                bw_cur = conn.cursor()
+                bw_cur.row_factory = None
+                bw_cur.execute(
+                    f"""
+                    SELECT stable_id, weight
+                    FROM lora_block_weights
+                    WHERE stable_id IN ({",".join("?" for _ in found_ids)})
+                    ORDER BY stable_id ASC, block_index ASC;
+                    """,
+                    found_ids,
+                )
+                for sid, group in groupby(bw_cur, key=itemgetter(0)):
+                    weights_by_sid[sid] = [float(weight) for _, weight in group]
+
+            excluded_loras: List[Dict[str, Any]] = []
+            warnings: List[str] = []
+            included_loras: List[LoRAComposeInput] = []
+            fallback_excluded_ids: List[str] = []
+
+            for stable_id in deduped_stable_ids:
+                if stable_id in missing_ids:
+                    excluded_loras.append(
+                        _make_excluded_lora_entry(
+                            stable_id=stable_id,
+                            filename=None,
+                            role=None,
+                            reason_code="missing_lora",
+                            reason_detail="Excluded because the requested LoRA was not found.",
+                        )
+                    )
+                    warnings.append(f"LoRA {stable_id} was not found and was excluded from combination.")
+                    continue
+
+                row = rows_by_sid[stable_id]
+                block_weights = weights_by_sid.get(stable_id, [])
+                has_rows = len(block_weights) > 0
+                has_flag = bool(row["has_block_weights"])
+
+                if not has_rows:
+                    fallback_excluded_ids.append(stable_id)
+                    excluded_loras.append(
+                        _make_excluded_lora_entry(
+                            stable_id=stable_id,
+                            filename=row["filename"],
+                            role=derive_role_from_path((row["file_path"] or "")),
+                            reason_code=FALLBACK_EXCLUDED_REASON_CODE,
+                            reason_detail=FALLBACK_EXCLUDED_REASON_DETAIL,
+                        )
+                    )
+                    if has_flag:
+                        warnings.append(
+                            f"LoRA {stable_id} indicates block weights in metadata but has no scanned rows; excluded by fallback policy."
+                        )
+                    continue
+
+                included_loras.append(
+                    LoRAComposeInput(
                         stable_id=stable_id,
-                        filename=row["filename"],
-                        role=derive_role_from_path((row["file_path"] or "")),
-                        reason_code=FALLBACK_EXCLUDED_REASON_CODE,
-                        reason_detail=FALLBACK_EXCLUDED_REASON_DETAIL,
+                        base_model_code=row["base_model_code"],
+                        block_layout=normalize_block_layout(row["block_layout"]),
+                        block_weights=block_weights,
                     )
                 )
-                if has_flag:
-                    warnings.append(
-                        f"LoRA {stable_id} indicates block weights in metadata but has no scanned rows; excluded by fallback policy."
-                    )
-                continue
 
-            included_loras.append(
-                LoRAComposeInput(
-                    stable_id=stable_id,
-                    base_model_code=row["base_model_code"],
-                    block_layout=normalize_block_layout(row["block_layout"]),
-                    block_weights=[float(r["weight"]) for r in bw_rows],
+            if fallback_excluded_ids:
+                warnings.append(
+                    f"Excluded {len(fallback_excluded_ids)} fallback LoRA(s): fallback LoRAs are not allowed in /api/lora/combine."
                 )
-            )
-
-        if fallback_excluded_ids:
-            warnings.append(
-                f"Excluded {len(fallback_excluded_ids)} fallback LoRA(s): fallback LoRAs are not allowed in /api/lora/combine."
-            )
 
-        if not included_loras:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "compatible": False,
-                    "validated_base_model": None,
-                    "validated_layout": None,
-                    "included_loras": [],
-                    "excluded_loras": excluded_loras,
-                    "reasons": [
-                        {
-                            "code": "all_loras_excluded",
-                            "detail": "All requested LoRAs were excluded by policy because they have no scanned block weights.",
-                            "stable_ids": fallback_excluded_ids,
-                        }
-                    ],
-                    "warnings": warnings,
-                },
-            )
+            if not included_loras:
+                raise HTTPException(
+                    status_code=400,
+                    detail={
+                        "compatible": False,
+                        "validated_base_model": None,
+                        "validated_layout": None,
+                        "included_loras": [],
+                        "excluded_loras": excluded_loras,
+                        "reasons": [
+                            {
+                                "code": "all_loras_excluded",
+                                "detail": "All requested LoRAs were excluded by policy because they have no scanned block weights.",
+                                "stable_ids": fallback_excluded_ids,
+                            }
+                        ],
+                        "warnings": warnings,
+                    },
+                )
 
-        validation = validate_compatibility(included_loras)
-        if not validation["compatible"]:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "compatible": False,
-                    "validated_base_model": validation["validated_base_model"],
-                    "validated_layout": validation["validated_layout"],
-                    "included_loras": [l.stable_id for l in included_loras],
-                    "excluded_loras": excluded_loras,
-                    "reasons": validation["reasons"],
-                    "warnings": warnings,
-                },
-            )
+            validation = validate_compatibility(included_loras)
+            if not validation["compatible"]:
+                raise HTTPException(
+                    status_code=400,
+                    detail={
+                        "compatible": False,
+                        "validated_base_model": validation["validated_base_model"],
+                        "validated_layout": validation["validated_layout"],
+                        "included_loras": [l.stable_id for l in included_loras],
+                        "excluded_loras": excluded_loras,
+                        "reasons": validation["reasons"],
+                        "warnings": warnings,
+                    },
+                )
 
-        per_lora_cfg: Dict[str, Dict[str, Any]] = {}
-        for stable_id, cfg in body.per_lora.items():
-            if hasattr(cfg, "model_dump"):
-                per_lora_cfg[stable_id] = cfg.model_dump(exclude_none=True)
+            # Dump the whole per_lora mapping in one serializer call rather than
+            # one model_dump() per LoRA.
+            per_lora_cfg: Dict[str, Dict[str, Any]]
+            if hasattr(body, "model_dump"):
+                per_lora_cfg = body.model_dump(include={"per_lora"}, exclude_none=True)["per_lora"]
             else:
-                per_lora_cfg[stable_id] = cfg.dict(exclude_none=True)
+                per_lora_cfg = body.dict(include={"per_lora"}, exclude_none=True)["per_lora"]
 
-        energy_inputs: List[LoRAEnergyInput] = []
-        for lora in included_loras:
-            row = rows_by_sid[lora.stable_id]
-            cfg = per_lora_cfg.setdefault(lora.stable_id, {})
+            energy_inputs: List[LoRAEnergyInput] = []
+            for lora in included_loras:
+                row = rows_by_sid[lora.stable_id]
+                cfg = per_lora_cfg.setdefault(lora.stable_id, {})
 
-            file_path_value = row["file_path"] if "file_path" in row.keys() else None
-            if has_file_path_column and (file_path_value is None or str(file_path_value).strip() == ""):
-                raise HTTPException(
-                    status_code=500,
-                    detail=(
-                        f"LoRA {lora.stable_id} is missing file_path; folder-derived role is required for deterministic combine."
-                    ),
-                )
-            role = derive_role_from_path(file_path_value or "")
-            raw_strength_model = float(cfg.get("strength_model", 1.0))
-            cfg["_requested_model_strength"] = raw_strength_model
-            cfg["_requested_clip_strength"] = float(cfg.get("strength_clip", 0.0))
-            energy_inputs.append(
-                LoRAEnergyInput(
-                    stable_id=lora.stable_id,
-                    role=role,
-                    block_weights=lora.block_weights,
-                    raw_strength_factor=raw_strength_model,
+                file_path_value = row["file_path"] if "file_path" in row.keys() else None
+                if has_file_path_column and (file_path_value is None or str(file_path_value).strip() == ""):
+                    raise HTTPException(
+                        status_code=500,
+                        detail=(
+                            f"LoRA {lora.stable_id} is missing file_path; folder-derived role is required for deterministic combine."
+                        ),
+                    )
+                role = derive_role_from_path(file_path_value or "")
+                raw_strength_model = float(cfg.get("strength_model", 1.0))
+                cfg["_requested_model_strength"] = raw_strength_model
+                cfg["_requested_clip_strength"] = float(cfg.get("strength_clip", 0.0))
+                energy_inputs.append(
+                    LoRAEnergyInput(
+                        stable_id=lora.stable_id,
+                        role=role,
+                        block_weights=lora.block_weights,
+                        raw_strength_factor=raw_strength_model,
+                    )
                 )
-            )
 
-        corrected_strengths = allocate_strengths_with_role_budget_and_overlap(
-            [compute_lora_energy_metrics(entry) for entry in energy_inputs]
-        )
-
-        for lora in included_loras:
-            cfg = per_lora_cfg.setdefault(lora.stable_id, {})
-            corrected_strength_model = float(corrected_strengths.get(lora.stable_id, 0.0))
-            cfg["strength_model"] = corrected_strength_model
-
-            # IMPORTANT (Phase 8.3 contract + tests):
-            # - We enforce clip OFF for non-clip contributors below.
-            # - We do NOT scale strength_clip by the model correction ratio for clip contributors.
-            #   User-tuned strength_clip remains user-tuned when clip is allowed.
-
-        clip_enforced_warnings: List[str] = []
-        for lora in included_loras:
-            row = rows_by_sid[lora.stable_id]
-            cfg = per_lora_cfg.setdefault(lora.stable_id, {})
-            if bool(row["clip_contributor"]):
-                continue
-            requested_affect_clip = bool(cfg.get("affect_clip", True))
-            requested_strength_clip = float(cfg.get("strength_clip", 0.0))
-            cfg["affect_clip"] = False
-            cfg["strength_clip"] = 0.0
-            if requested_affect_clip or requested_strength_clip != 0.0:
-                clip_enforced_warnings.append(
-                    f"LoRA {lora.stable_id} is not a clip contributor; clip was ignored for this LoRA."
-                )
+            corrected_strengths = allocate_strengths_with_role_budget_and_overlap(
+                [compute_lora_energy_metrics(entry) for entry in energy_inputs]
+            )
 
-        compose_result = combine_weights_weighted_average(
-            included_loras=included_loras,
-            per_lora=per_lora_cfg,
-            validated_layout=validation["validated_layout"],
-        )
+            for lora in included_loras:
+                cfg = per_lora_cfg.setdefault(lora.stable_id, {})
+                corrected_strength_model = float(corrected_strengths.get(lora.stable_id, 0.0))
+                cfg["strength_model"] = corrected_strength_model
+
+                # IMPORTANT (Phase 8.3 contract + tests):
+                # - We enforce clip OFF for non-clip contributors below.
+                # - We do NOT scale strength_clip by the model correction ratio for clip contributors.
+                #   User-tuned strength_clip remains user-tuned when clip is allowed.
+
+            clip_enforced_warnings: List[str] = []
+            for lora in included_loras:
+                row = rows_by_sid[lora.stable_id]
+                cfg = per_lora_cfg.setdefault(lora.stable_id, {})
+                if bool(row["clip_contributor"]):
+                    continue
+                requested_affect_clip = bool(cfg.get("affect_clip", True))
+                requested_strength_clip = float(cfg.get("strength_clip", 0.0))
+                cfg["affect_clip"] = False
+                cfg["strength_clip"] = 0.0
+                if requested_affect_clip or requested_strength_clip != 0.0:
+                    clip_enforced_warnings.append(
+                        f"LoRA {lora.stable_id} is not a clip contributor; clip was ignored for this LoRA."
+                    )
 
-        return {
-            "response_schema_version": "7.1",
-            "compatible": True,
-            "validated_base_model": validation["validated_base_model"],
-            "validated_layout": validation["validated_layout"],
-            "included_loras": [l.stable_id for l in included_loras],
-            "excluded_loras": excluded_loras,
-            "reasons": [],
-            "warnings": warnings + clip_enforced_warnings + compose_result["warnings"],
-            "combined": _build_combined_response_payload(compose_result),
-            "node_payloads": _build_node_payloads(
+            compose_result = combine_weights_weighted_average(
                 included_loras=included_loras,
-                rows_by_sid=rows_by_sid,
-                per_lora_cfg=per_lora_cfg,
-                compose_result=compose_result,
-            ),
-        }
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc))
-    finally:
-        conn.close()
+                per_lora=per_lora_cfg,
+                validated_layout=validation["validated_layout"],
+            )
+
+            return FastJSONResponse(content={
+                "response_schema_version": "7.1",
+                "compatible": True,
+                "validated_base_model": validation["validated_base_model"],
+                "validated_layout": validation["validated_layout"],
+                "included_loras": [l.stable_id for l in included_loras],
+                "excluded_loras": excluded_loras,
+                "reasons": [],
+                "warnings": warnings + clip_enforced_warnings + compose_result["warnings"],
+                "combined": _build_combined_response_payload(compose_result),
+                "node_payloads": _build_node_payloads(
+                    included_loras=included_loras,
+                    rows_by_sid=rows_by_sid,
+                    per_lora_cfg=per_lora_cfg,
+                    compose_result=compose_result,
+                ),
+            })
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
 
 
 @app.post("/api/lora/combined-profile", status_code=201)
@@ -1159,12 +1772,7 @@ def api_lora_combined_profile_create(body: CombinedProfileSaveRequest):
     combined_payload = combine_response
     now = _now_iso()
 
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
         cur = conn.cursor()
         cur.execute(
             """
@@ -1211,18 +1819,11 @@ def api_lora_combined_profile_create(body: CombinedProfileSaveRequest):
             "validated_base_model": combine_response["validated_base_model"],
             "validated_layout": combine_response["validated_layout"],
         }
-    finally:
-        conn.close()
 
 
 @app.get("/api/lora/combined-profiles")
 def api_lora_combined_profiles_list():
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
         cur = conn.cursor()
         cur.execute(
             """
@@ -1240,7 +1841,8 @@ def api_lora_combined_profiles_list():
         )
         rows = cur.fetchall()
 
-        return {
+        # Plain JSON types only: render directly, skipping jsonable_encoder.
+        return FastJSONResponse(content={
             "profiles": [
                 {
                     "id": row["id"],
@@ -1253,19 +1855,12 @@ def api_lora_combined_profiles_list():
                 }
                 for row in rows
             ]
-        }
-    finally:
-        conn.close()
+        })
 
 
 @app.get("/api/lora/combined-profile/{combined_profile_id}")
 def api_lora_combined_profile_get_by_id(combined_profile_id: int):
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
         cur = conn.cursor()
         cur.execute("SELECT * FROM lora_combined_profiles WHERE id = ?;", (combined_profile_id,))
         row = cur.fetchone()
@@ -1273,8 +1868,6 @@ def api_lora_combined_profile_get_by_id(combined_profile_id: int):
             raise HTTPException(status_code=404, detail=f"Combined profile {combined_profile_id} not found.")
 
         return _combined_profile_row_to_response(row)
-    finally:
-        conn.close()
 
 
 @app.get("/api/lora/combined-profile/by-name/{profile_name}")
@@ -1283,12 +1876,7 @@ def api_lora_combined_profile_get_by_name(profile_name: str):
     if not normalized_name:
         raise HTTPException(status_code=404, detail="Combined profile name must be non-empty.")
 
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
         cur = conn.cursor()
         cur.execute(
             """
@@ -1305,8 +1893,6 @@ def api_lora_combined_profile_get_by_name(profile_name: str):
             raise HTTPException(status_code=404, detail=f"Combined profile '{normalized_name}' not found.")
 
         return _combined_profile_row_to_response(row)
-    finally:
-        conn.close()
 
 # ----------------------------------------------------------------------
 # /api/lora/catalog â€“ catalog alias endpoint
@@ -1320,6 +1906,7 @@ def api_lora_catalog(
     has_blocks: Optional[int] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=5000),
     offset: int = Query(default=0, ge=0),
+    if_none_match: Optional[str] = Header(default=None),
 ):
     return api_lora_search(
         base=base,
@@ -1328,6 +1915,7 @@ def api_lora_catalog(
         has_blocks=has_blocks,
         limit=limit,
         offset=offset,
+        if_none_match=if_none_match,
     )
 
 
@@ -1335,6 +1923,236 @@ def api_lora_catalog(
 # /api/lora/search â€“ main list endpoint used by the React UI
 # ----------------------------------------------------------------------
 
+# Rows per chunk written to the socket by the streamed search response.
+SEARCH_STREAM_BATCH_ROWS = 256
+
+
+# Same settings JSONResponse passes to json.dumps(), built once instead of per call.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _dump_json(obj: Any) -> bytes:
+    """Serialize exactly as FastJSONResponse would render `obj`."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
+
+
+def _load_json(raw: Any) -> Any:
+    """Parse JSON text with orjson when available, else the stdlib parser."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _search_result_from_row(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    # `row` is a plain tuple in _SEARCH_COLUMNS order.
+    result = dict(zip(_SEARCH_COLUMNS, row))
+    result["clip_contributor"] = bool(result["clip_contributor"])
+    result["role"] = derive_role_from_path(result["file_path"] or "")
+    layout, warnings = _classify_search_row_layout(
+        result["base_model_code"], bool(result["has_block_weights"]), result["block_layout"]
+    )
+    result["block_layout"] = layout
+    if warnings:
+        result["validation_warnings"] = list(warnings)
+    return result
+
+
+def _search_snapshot(
+    count_sql: str,
+    page_sql: str,
+    params: List[Any],
+    *,
+    limit: int,
+    offset: int,
+) -> Iterator[Any]:
+    """
+    Run one /api/lora/search inside a single read transaction.
+
+    The first value yielded is the response's ETag (None when lora_generation
+    is not maintained). The caller either closes the generator there (304,
+    cached body) or streams the rest, which is the JSON body:
+    {"results":[...],"count":N,"total":T,"limit":L,"offset":O}
+
+    The write counter, the COUNT and the page are all read from the same
+    snapshot on the same connection, so the tag, `total` and the rows always
+    belong together, whatever a reindex commits meanwhile. The connection is
+    borrowed when the generator is first advanced and goes back to the pool
+    when it finishes or is closed.
+    """
+    with _api_db_connection() as conn, closing(conn.cursor()) as cur:
+        # closing(): if the client disconnects mid-stream, the half-read
+        # statement ends before the connection goes back to the pool, which
+        # rolls the read transaction back and so drops its WAL snapshot.
+        cur.row_factory = None
+        cur.execute("BEGIN")
+
+        etag: Optional[str] = None
+        if _lora_generation_ready:
+            generation = cur.execute("SELECT generation FROM lora_generation WHERE id = 0;").fetchone()[0]
+            etag = _search_etag(generation, count_sql, params, limit, offset)
+        yield etag
+
+        # Total count (for pagination); known before the first byte is sent.
+        total = cur.execute(count_sql, params).fetchone()[0]
+        yield b'{"results":['
+
+        count = 0
+        cur.execute(page_sql, params + [limit, offset])
+        while True:
+            rows = cur.fetchmany(SEARCH_STREAM_BATCH_ROWS)
+            if not rows:
+                break
+            # One serializer call per batch; strip the list brackets to splice
+            # the rows into the surrounding array.
+            chunk = _dump_json([_search_result_from_row(row) for row in rows])[1:-1]
+            yield (b"," if count else b"") + chunk
+            count += len(rows)
+        conn.commit()
+
+    yield f'],"count":{count},"total":{total},"limit":{limit},"offset":{offset}}}'.encode("ascii")
+
+
+_SEARCH_COLUMNS = (
+    "id", "stable_id", "filename", "file_path",
+    "base_model_name", "base_model_code",
+    "category_name", "category_code",
+    "model_family", "lora_type", "rank",
+    "has_block_weights", "block_layout", "clip_contributor",
+    "created_at", "updated_at",
+)
+_SEARCH_COLUMNS_SQL = f"SELECT {', '.join(_SEARCH_COLUMNS)}"
+
+
+def _filename_search_params(term: str) -> Tuple[bool, Tuple[str, ...]]:
+    """
+    (use_fts, parameters) for a stripped, non-empty filename search term.
+
+    The term is a literal substring that ignores ASCII case only, as LIKE
+    does; `%` and `_` in it are not wildcards. Terms of 3+ characters also
+    get a quoted FTS5 phrase: the trigram index narrows the rows, then the
+    same escaped LIKE decides. The trigram tokenizer folds Unicode case
+    ("émm" matches "Émma"), so without the LIKE the answer would change once
+    a search term reached three characters. Shorter terms (no full trigram)
+    use the LIKE alone.
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    if _lora_fts_ready and len(term) >= 3:
+        return True, ('"' + term.replace('"', '""') + '"', pattern)
+    return False, (pattern,)
+
+
+@lru_cache(maxsize=32)
+def _search_sql(
+    by_base: bool,
+    by_category: bool,
+    by_filename: bool,
+    blocks_only: bool,
+    use_fts: bool = False,
+) -> Tuple[str, str]:
+    """
+    (count_sql, page_sql) for one combination of /api/lora/search filters.
+
+    The filename parameters come from _filename_search_params: an FTS5
+    phrase matched against lora_fts plus an escaped LIKE pattern when
+    use_fts, else the LIKE pattern alone.
+
+    Each filter combination has exactly one SQL text, built once; every
+    request with the same filters then hits the connection's statement cache.
+    Placeholders are in base, category, filename order; page_sql adds LIMIT
+    and OFFSET.
+    """
+    where_clauses: List[str] = []
+    if by_base:
+        where_clauses.append("base_model_code = ?")
+    if by_category:
+        where_clauses.append("category_code = ?")
+    if by_filename:
+        if use_fts:
+            where_clauses.append("id IN (SELECT rowid FROM lora_fts WHERE lora_fts MATCH ?)")
+        # LIKE already ignores ASCII case; LOWER() added nothing.
+        where_clauses.append("filename LIKE ? ESCAPE '\\'")
+    if blocks_only:
+        where_clauses.append("has_block_weights = 1")
+
+    from_sql = " FROM lora"
+    if where_clauses:
+        from_sql += " WHERE " + " AND ".join(where_clauses)
+
+    return (
+        f"SELECT COUNT(*) AS cnt{from_sql}",
+        # Every index used here ends in (filename, rowid), so the id tiebreak
+        # is already index order: pages over duplicate filenames are stable
+        # and the planner still stops after LIMIT rows without a sort.
+        f"{_SEARCH_COLUMNS_SQL}{from_sql} ORDER BY filename ASC, id ASC LIMIT ? OFFSET ?",
+    )
+
+
+def _search_etag(generation: int, count_sql: str, params: List[Any], limit: int, offset: int) -> str:
+    # count_sql + params identify the filters; the page adds limit/offset.
+    key = f"{generation}|{count_sql}|{params!r}|{limit}|{offset}|{DB_PATH}"
+    return '"' + hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+# Finished /api/lora/search bodies, keyed by their ETag. The tag already
+# covers the filters, the page and the lora write counter, so any write to
+# lora makes old entries unreachable; they age out of the LRU.
+SEARCH_CACHE_SIZE = 128
+# Larger pages (limit up to 5000) are streamed every time rather than held.
+SEARCH_CACHE_MAX_BODY_BYTES = 512 * 1024
+
+_search_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+
+def _search_cache_get(etag: str) -> Optional[bytes]:
+    with _search_cache_lock:
+        body = _search_cache.get(etag)
+        if body is not None:
+            _search_cache.move_to_end(etag)
+        return body
+
+
+def _search_cache_put(etag: str, body: bytes) -> None:
+    if len(body) > SEARCH_CACHE_MAX_BODY_BYTES:
+        return
+    with _search_cache_lock:
+        _search_cache[etag] = body
+        _search_cache.move_to_end(etag)
+        while len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
+
+def clear_search_cache() -> None:
+    with _search_cache_lock:
+        _search_cache.clear()
+
+
+def _caching_search_stream(etag: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    # `chunks` is the rest of the _search_snapshot that yielded `etag`, so the
+    # body is stored under the generation it was actually read at. Pass the
+    # stream through untouched; only a body that was sent in full (no client
+    # disconnect, no error) is kept.
+    parts: List[bytes] = []
+    size = 0
+    with closing(chunks):
+        for chunk in chunks:
+            if size <= SEARCH_CACHE_MAX_BODY_BYTES:
+                parts.append(chunk)
+                size += len(chunk)
+            yield chunk
+    if size <= SEARCH_CACHE_MAX_BODY_BYTES:
+        _search_cache_put(etag, b"".join(parts))
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    # If-None-Match: "a", W/"b" -- weak validators compare equal for GET.
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates or "*" in candidates
+
+
 @app.get("/api/lora/search")
 def api_lora_search(
     base: Optional[str] = Query(
@@ -1364,81 +2182,49 @@ def api_lora_search(
         ge=0,
         description="Number of rows to skip (for pagination).",
     ),
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """
     Search LoRAs in lora_master.db with pagination support.
-    """
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
-        base_sql = " FROM lora"
-
-        where_clauses: List[str] = []
-        params: List[Any] = []
-
-        if base and base.upper() != "ALL":
-            where_clauses.append("base_model_code = ?")
-            params.append(base.upper())
-
-        if category and category.upper() != "ALL":
-            where_clauses.append("category_code = ?")
-            params.append(category.upper())
-
-        if search and search.strip():
-            where_clauses.append("LOWER(filename) LIKE ?")
-            params.append(f"%{search.strip().lower()}%")
-
-        if has_blocks == 1:
-            where_clauses.append("has_block_weights = 1")
-
-        where_sql = ""
-        if where_clauses:
-            where_sql = " WHERE " + " AND ".join(where_clauses)
 
-        # Total count (for pagination)
-        cur = conn.cursor()
-        cur.execute(f"SELECT COUNT(*) AS cnt{base_sql}{where_sql}", params)
-        total = cur.fetchone()["cnt"]
-
-        # Paginated results
-        select_sql = """
-            SELECT
-                id, stable_id, filename, file_path,
-                base_model_name, base_model_code,
-                category_name, category_code,
-                model_family, lora_type, rank,
-                has_block_weights, block_layout, clip_contributor,
-                created_at, updated_at
-        """
-        order_sql = " ORDER BY filename ASC LIMIT ? OFFSET ?"
-        page_params = params + [limit, offset]
-
-        cur.execute(f"{select_sql}{base_sql}{where_sql}{order_sql}", page_params)
-        rows = cur.fetchall()
-
-        results = []
-        for row in rows:
-            result = row_to_dict(row)
-            result["clip_contributor"] = bool(result.get("clip_contributor"))
-            result["role"] = derive_role_from_path(result.get("file_path") or "")
-            layout, warnings = validate_block_layout_for_search_row(result)
-            result["block_layout"] = layout
-            if warnings:
-                result["validation_warnings"] = warnings
-            results.append(result)
-
-        return {
-            "results": results,
-            "count": len(results),
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-        }
-    finally:
-        conn.close()
+    Responses carry an ETag derived from the lora write counter and the
+    filters; a matching If-None-Match gets a 304 without running the search,
+    and a recently served body for the same tag is replayed from memory.
+    """
+    by_base = bool(base) and base.upper() != "ALL"
+    by_category = bool(category) and category.upper() != "ALL"
+    by_filename = bool(search) and bool(search.strip())
+    blocks_only = has_blocks == 1
+
+    use_fts = False
+    params: List[Any] = []
+    if by_base:
+        params.append(base.upper())
+    if by_category:
+        params.append(category.upper())
+    if by_filename:
+        use_fts, filename_params = _filename_search_params(search.strip())
+        params.extend(filename_params)
+
+    count_sql, page_sql = _search_sql(by_base, by_category, by_filename, blocks_only, use_fts)
+
+    snapshot = _search_snapshot(count_sql, page_sql, params, limit=limit, offset=offset)
+    etag = next(snapshot)
+    if etag is None:
+        return StreamingResponse(snapshot, media_type="application/json")
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and _etag_matches(etag, if_none_match):
+        snapshot.close()
+        return Response(status_code=304, headers=headers)
+
+    cached = _search_cache_get(etag)
+    if cached is not None:
+        snapshot.close()
+        return Response(content=cached, media_type="application/json", headers=headers)
+
+    body = _caching_search_stream(etag, snapshot)
+    return StreamingResponse(body, media_type="application/json", headers=headers)
 
 
 # ----------------------------------------------------------------------
@@ -1459,6 +2245,16 @@ def api_index_status_alias():
     return api_index_status()
 
 
+@app.get("/api/lora/reindex_status/{job_id}")
+def api_reindex_status(job_id: str):
+    """State of one /api/lora/reindex_all job (status, duration_sec, summary, error)."""
+    with _index_status_lock:
+        job = _reindex_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown reindex job: {job_id}")
+    return job
+
+
 # ----------------------------------------------------------------------
 # /api/lora/{stable_id} â€“ single LoRA details
 # ----------------------------------------------------------------------
@@ -1469,149 +2265,214 @@ def api_lora_details(stable_id: str):
     Return full details for a LoRA identified by its stable_id.
     Used by the details panel in the UI.
     """
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM lora WHERE stable_id = ?;", (stable_id,))
-        row = cur.fetchone()
+    with _api_db_connection() as conn:
+        detail_columns = ", ".join(c for c in _lora_columns if c in _DETAIL_COLUMNS) or "*"
+        row = conn.execute(f"SELECT {detail_columns} FROM lora WHERE stable_id = ?;", (stable_id,)).fetchone()
         if row is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No LoRA found with stable_id '{stable_id}'",
             )
-        result = row_to_dict(row)
+        result = dict(row)
         result["clip_contributor"] = bool(result.get("clip_contributor"))
-        return result
-    finally:
-        conn.close()
+        return FastJSONResponse(content=result)
 
 
 # ----------------------------------------------------------------------
 # /api/lora/{stable_id}/blocks â€“ block weight profile
 # ----------------------------------------------------------------------
 
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _fallback_blocks_payload(
+    base_model_code: Optional[str],
+    block_layout: Optional[str],
+) -> Tuple[Optional[str], bool, Optional[str], Tuple[Dict[str, Any], ...], Tuple[str, ...]]:
+    """
+    /blocks body parts for a LoRA without stored weights:
+    (block_layout, fallback, fallback_reason, blocks, validation_warnings).
+
+    Depends only on the base model and stored layout, so it is built once per
+    combination. The cached blocks are shared between responses; never mutate them.
+    """
+    normalized_layout = normalize_block_layout(block_layout)
+    if _should_force_flux_fallback_layout(base_model_code, False):
+        normalized_layout = FLUX_FALLBACK_16
+
+    fallback_count = fallback_block_count_for_layout(normalized_layout)
+    fallback = fallback_count is not None
+    fallback_reason = (
+        "No stored block weights; using neutral fallback profile for "
+        f"layout {normalized_layout}"
+        if fallback and normalized_layout
+        else None
+    )
+
+    fallback_blocks = (
+        [
+            {"block_index": i, "weight": 1.0, "raw_strength": None}
+            for i in range(fallback_count)
+        ]
+        if fallback_count is not None
+        else []
+    )
+
+    final_layout, final_blocks, warnings = validate_blocks_response(
+        stable_id="",
+        base_model_code=base_model_code,
+        has_blocks=False,
+        lora_type=None,
+        block_layout=normalized_layout,
+        blocks=fallback_blocks,
+        fallback=fallback,
+    )
+    return final_layout, fallback, fallback_reason, tuple(final_blocks), tuple(warnings)
+
+
+def _blocks_payload(
+    stable_id: str,
+    lora_row: Tuple[Any, ...],
+    block_rows: Iterable[Tuple[Any, ...]],
+) -> Dict[str, Any]:
+    """
+    /blocks body for one LoRA.
+
+    lora_row is (has_block_weights, lora_type, block_layout, base_model_code);
+    block_rows end in (block_index, weight, raw_strength), in block order, and
+    rows with a NULL block_index (LoRA without blocks) are skipped.
+    """
+    has_blocks_flag, lora_type, block_layout, base_model_code = lora_row
+
+    if not has_blocks_flag:
+        final_layout, fallback, fallback_reason, final_blocks, warnings = _fallback_blocks_payload(
+            base_model_code, block_layout
+        )
+        return {
+            "stable_id": stable_id,
+            "has_block_weights": False,
+            "block_layout": final_layout,
+            "fallback": fallback,
+            "fallback_reason": fallback_reason,
+            "blocks": final_blocks,
+            "validation_warnings": list(warnings),
+        }
+
+    blocks = [
+        {
+            "block_index": block_index,
+            "weight": float(weight),
+            "raw_strength": None if raw_strength is None else float(raw_strength),
+        }
+        for *_lora, block_index, weight, raw_strength in block_rows
+        if block_index is not None
+    ]
+
+    final_layout, final_blocks, warnings = validate_blocks_response(
+        stable_id=stable_id,
+        base_model_code=base_model_code,
+        has_blocks=True,
+        lora_type=lora_type,
+        block_layout=block_layout,
+        blocks=blocks,
+        fallback=False,
+        pre_sorted=True,
+    )
+
+    return {
+        "stable_id": stable_id,
+        "has_block_weights": bool(final_blocks),
+        "block_layout": final_layout,
+        "fallback": False,
+        "fallback_reason": None,
+        "blocks": final_blocks,
+        "validation_warnings": warnings,
+    }
+
+
 @app.get("/api/lora/{stable_id}/blocks")
 def api_lora_blocks(stable_id: str):
     """
     Return per-block weights for a LoRA (if present).
     """
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
+        # One round trip: the LoRA row joined to its blocks (plain tuples, in
+        # block order). A LoRA without blocks yields a single row whose block
+        # columns are NULL; the join is skipped for it entirely. Matching on
+        # the rowid pins one LoRA, so idx_lbw_lora_idx supplies the order and
+        # no sort is needed.
         cur = conn.cursor()
-
-        # Look up LoRA by stable_id first
+        cur.row_factory = None
         cur.execute(
-            "SELECT id, has_block_weights, lora_type, block_layout, base_model_code FROM lora WHERE stable_id = ?;",
+            """
+            SELECT l.has_block_weights, l.lora_type, l.block_layout, l.base_model_code,
+                   b.block_index, b.weight, b.raw_strength
+            FROM lora l
+            LEFT JOIN lora_block_weights b
+                ON b.lora_id = l.id AND l.has_block_weights = 1
+            WHERE l.id = (SELECT id FROM lora WHERE stable_id = ? LIMIT 1)
+            ORDER BY b.block_index ASC;
+            """,
             (stable_id,),
         )
-        row = cur.fetchone()
-        if row is None:
+        rows = cur.fetchall()
+        if not rows:
             raise HTTPException(
                 status_code=404,
                 detail=f"No LoRA found with stable_id '{stable_id}'",
             )
 
-        lora_id = row["id"]
-        has_blocks = bool(row["has_block_weights"])
-        lora_type = row["lora_type"]
-        base_model_code = row["base_model_code"]
-        block_layout = row["block_layout"]
+        return FastJSONResponse(content=_blocks_payload(stable_id, rows[0][:4], rows))
 
-        if not has_blocks:
-            normalized_layout = normalize_block_layout(block_layout)
-            if _should_force_flux_fallback_layout(base_model_code, has_blocks):
-                normalized_layout = FLUX_FALLBACK_16
-
-            fallback_count = fallback_block_count_for_layout(normalized_layout)
-            fallback = fallback_count is not None
-            fallback_reason = (
-                "No stored block weights; using neutral fallback profile for "
-                f"layout {normalized_layout}"
-                if fallback and normalized_layout
-                else None
-            )
 
-            fallback_blocks = (
-                [
-                    {"block_index": i, "weight": 1.0, "raw_strength": None}
-                    for i in range(fallback_count)
-                ]
-                if fallback_count is not None
-                else []
-            )
+# Upper bound on stable_ids per /api/lora/blocks_batch call (one SQL variable each).
+BLOCKS_BATCH_MAX_IDS = 500
 
-            final_layout, final_blocks, warnings = validate_blocks_response(
-                stable_id=stable_id,
-                base_model_code=base_model_code,
-                has_blocks=False,
-                lora_type=lora_type,
-                block_layout=normalized_layout,
-                blocks=fallback_blocks,
-                fallback=fallback,
-            )
 
-            return {
-                "stable_id": stable_id,
-                "has_block_weights": False,
-                "block_layout": final_layout,
-                "fallback": fallback,
-                "fallback_reason": fallback_reason,
-                "blocks": final_blocks,
-                "validation_warnings": warnings,
-            }
+@app.post("/api/lora/blocks_batch")
+def api_lora_blocks_batch(body: LoRABlocksBatchRequest):
+    """
+    /blocks for several LoRAs in one request and one query.
 
-        # Has blocks: fetch them
-        cur.execute(
-            """
-            SELECT block_index, weight, raw_strength
-            FROM lora_block_weights
-            WHERE lora_id = ?
-            ORDER BY block_index ASC;
-            """,
-            (lora_id,),
+    "results" holds one /blocks body per found stable_id, in request order
+    (duplicates dropped); "missing" lists the stable_ids with no LoRA.
+    """
+    stable_ids = list(dict.fromkeys(sid.strip() for sid in body.stable_ids if sid and sid.strip()))
+    if not stable_ids:
+        raise HTTPException(status_code=400, detail="stable_ids must contain at least one stable_id.")
+    if len(stable_ids) > BLOCKS_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BLOCKS_BATCH_MAX_IDS} stable_ids per request.",
         )
-        blocks_rows = cur.fetchall()
 
-        blocks = [
-            {
-                "block_index": r["block_index"],
-                "weight": float(r["weight"]),
-                "raw_strength": float(r["raw_strength"])
-                if r["raw_strength"] is not None
-                else None,
-            }
-            for r in blocks_rows
-        ]
-
-        final_layout, final_blocks, warnings = validate_blocks_response(
-            stable_id=stable_id,
-            base_model_code=base_model_code,
-            has_blocks=True,
-            lora_type=lora_type,
-            block_layout=block_layout,
-            blocks=blocks,
-            fallback=False,
+    placeholders = ",".join("?" for _ in stable_ids)
+    payloads: Dict[str, Dict[str, Any]] = {}
+    with _api_db_connection() as conn, closing(conn.cursor()) as cur:
+        # Same row shape as /blocks, prefixed with stable_id. MIN(id) picks the
+        # same row /blocks would for a duplicated stable_id; ordering by the
+        # LoRA rowid keeps each LoRA's blocks contiguous for groupby().
+        cur.row_factory = None
+        cur.execute(
+            f"""
+            SELECT l.stable_id, l.has_block_weights, l.lora_type, l.block_layout, l.base_model_code,
+                   b.block_index, b.weight, b.raw_strength
+            FROM lora l
+            LEFT JOIN lora_block_weights b
+                ON b.lora_id = l.id AND l.has_block_weights = 1
+            WHERE l.id IN (
+                SELECT MIN(id) FROM lora WHERE stable_id IN ({placeholders}) GROUP BY stable_id
+            )
+            ORDER BY l.id ASC, b.block_index ASC;
+            """,
+            stable_ids,
         )
+        for stable_id, group in groupby(cur, key=itemgetter(0)):
+            rows = list(group)
+            payloads[stable_id] = _blocks_payload(stable_id, rows[0][1:5], rows)
 
-        return {
-            "stable_id": stable_id,
-            "has_block_weights": bool(final_blocks),
-            "block_layout": final_layout,
-            "fallback": False,
-            "fallback_reason": None,
-            "blocks": final_blocks,
-            "validation_warnings": warnings,
-        }
-    finally:
-        conn.close()
+    return FastJSONResponse(content={
+        "results": [payloads[sid] for sid in stable_ids if sid in payloads],
+        "missing": [sid for sid in stable_ids if sid not in payloads],
+    })
 
 
 # ----------------------------------------------------------------------
@@ -1619,26 +2480,69 @@ def api_lora_blocks(stable_id: str):
 # ----------------------------------------------------------------------
 
 def _lookup_lora_by_stable_id(conn: sqlite3.Connection, stable_id: str) -> sqlite3.Row:
-    cur = conn.cursor()
-    cur.execute("SELECT id, stable_id, block_layout FROM lora WHERE stable_id = ?;", (stable_id,))
-    row = cur.fetchone()
+    row = conn.execute("SELECT id, stable_id, block_layout FROM lora WHERE stable_id = ?;", (stable_id,)).fetchone()
     if row is None:
         raise HTTPException(status_code=404, detail=f"No LoRA found with stable_id '{stable_id}'")
     return row
 
 
-@app.get("/api/lora/{stable_id}/profiles")
-def api_lora_profiles_list(stable_id: str):
-    """List all saved user profiles for a LoRA."""
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
+def _pack_block_weights(block_weights: List[float]) -> bytes:
+    """Profile weights as stored: a BLOB of little-endian float64 values."""
+    packed = array("d", block_weights)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_block_weights(raw: Any) -> List[Any]:
+    """
+    Inverse of _pack_block_weights. Rows written before weights were stored
+    as BLOBs still hold JSON text and are decoded as such.
 
+    Raises ValueError/TypeError for unreadable values.
+    """
+    if not isinstance(raw, bytes):
+        return _load_json(raw)
+    if len(raw) % 8:
+        raise ValueError(f"block_weights BLOB of {len(raw)} bytes is not a float64 array.")
+    unpacked = array("d")
+    unpacked.frombytes(raw)
+    if sys.byteorder != "little":
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+def _coerce_block_weights(raw: Any) -> List[float]:
+    """Validate a request's block_weights array and convert it to floats (HTTP 400 on bad input)."""
+    if not isinstance(raw, list):
+        raise HTTPException(status_code=400, detail="block_weights must be an array of floats.")
+    # JSON bodies already decode numbers to float; only convert what isn't one.
+    if all(type(w) is float for w in raw):
+        return raw
     try:
-        _lookup_lora_by_stable_id(conn, stable_id)
+        return list(map(float, raw))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="All block_weights values must be numeric.")
+
+
+def _check_block_weights_length(block_weights: List[float], layout: Optional[str]) -> None:
+    if not layout:
+        return
+    expected = expected_block_count_for_layout(layout)
+    if expected is not None and len(block_weights) != expected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"block_weights length {len(block_weights)} does not match expected {expected} for layout '{layout}'.",
+        )
 
+
+@app.get("/api/lora/{stable_id}/profiles")
+def api_lora_profiles_list(stable_id: str):
+    """List all saved user profiles for a LoRA."""
+    with _api_db_connection() as conn:
+        # Plain tuples, unpacked in SELECT order below.
         cur = conn.cursor()
+        cur.row_factory = None
         cur.execute(
             """
             SELECT id, profile_name, block_weights, created_at, updated_at
@@ -1649,24 +2553,27 @@ def api_lora_profiles_list(stable_id: str):
             (stable_id,),
         )
         rows = cur.fetchall()
+        if not rows:
+            # Only an empty list needs the LoRA lookup (404 vs. no profiles yet).
+            _lookup_lora_by_stable_id(conn, stable_id)
 
         profiles = []
-        for r in rows:
+        for profile_id, profile_name, raw_weights, created_at, updated_at in rows:
+            profile = {
+                "id": profile_id,
+                "profile_name": profile_name,
+                "block_weights": [],
+                "created_at": created_at,
+                "updated_at": updated_at,
+            }
             try:
-                weights = json.loads(r["block_weights"])
-            except (json.JSONDecodeError, TypeError):
-                weights = []
-            profiles.append({
-                "id": r["id"],
-                "profile_name": r["profile_name"],
-                "block_weights": weights,
-                "created_at": r["created_at"],
-                "updated_at": r["updated_at"],
-            })
+                profile["block_weights"] = _unpack_block_weights(raw_weights)
+            except (ValueError, TypeError) as exc:
+                # One unreadable row must not hide the LoRA's other profiles.
+                profile["block_weights_error"] = f"Stored block_weights are unreadable: {exc}"
+            profiles.append(profile)
 
-        return {"stable_id": stable_id, "profiles": profiles}
-    finally:
-        conn.close()
+        return FastJSONResponse(content={"stable_id": stable_id, "profiles": profiles})
 
 
 @app.post("/api/lora/{stable_id}/profiles")
@@ -1676,137 +2583,113 @@ def api_lora_profiles_create(stable_id: str, body: Dict[str, Any] = Body(...)):
     if not profile_name:
         raise HTTPException(status_code=400, detail="profile_name is required and must be non-empty.")
 
-    block_weights = body.get("block_weights")
-    if not isinstance(block_weights, list):
-        raise HTTPException(status_code=400, detail="block_weights must be an array of floats.")
+    block_weights = _coerce_block_weights(body.get("block_weights"))
 
-    try:
-        block_weights = [float(w) for w in block_weights]
-    except (TypeError, ValueError):
-        raise HTTPException(status_code=400, detail="All block_weights values must be numeric.")
-
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
         lora_row = _lookup_lora_by_stable_id(conn, stable_id)
         lora_id = lora_row["id"]
-        layout = lora_row["block_layout"]
-
-        if layout:
-            expected = expected_block_count_for_layout(layout)
-            if expected is not None and len(block_weights) != expected:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"block_weights length {len(block_weights)} does not match expected {expected} for layout '{layout}'.",
-                )
+        _check_block_weights_length(block_weights, lora_row["block_layout"])
 
         now = _now_iso()
         cur = conn.cursor()
         cur.execute(
             """
             INSERT INTO lora_user_profiles (lora_id, stable_id, profile_name, block_weights, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?);
+            VALUES (?, ?, ?, ?, ?, ?)
+            RETURNING id, created_at, updated_at;
             """,
-            (lora_id, stable_id, profile_name, json.dumps(block_weights), now, now),
+            (lora_id, stable_id, profile_name, _pack_block_weights(block_weights), now, now),
         )
+        created = cur.fetchone()
         conn.commit()
-        new_id = cur.lastrowid
 
         return {
-            "id": new_id,
+            "id": created["id"],
             "profile_name": profile_name,
             "block_weights": block_weights,
-            "created_at": now,
-            "updated_at": now,
+            "created_at": created["created_at"],
+            "updated_at": created["updated_at"],
         }
-    finally:
-        conn.close()
 
 
 @app.put("/api/lora/{stable_id}/profiles/{profile_id}")
 def api_lora_profiles_update(stable_id: str, profile_id: int, body: Dict[str, Any] = Body(...)):
     """Update an existing user override profile."""
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
-        lora_row = _lookup_lora_by_stable_id(conn, stable_id)
-        layout = lora_row["block_layout"]
-
+    with _api_db_connection() as conn:
+        # Profile and its LoRA's layout in one query; the separate LoRA lookup
+        # only runs on a miss, to tell "no such LoRA" from "no such profile".
         cur = conn.cursor()
         cur.execute(
-            "SELECT id, profile_name, block_weights FROM lora_user_profiles WHERE id = ? AND stable_id = ?;",
+            """
+            SELECT l.block_layout, p.block_weights
+            FROM lora_user_profiles p
+            JOIN lora l ON l.stable_id = p.stable_id
+            WHERE p.id = ? AND p.stable_id = ?;
+            """,
             (profile_id, stable_id),
         )
         existing = cur.fetchone()
         if existing is None:
+            _lookup_lora_by_stable_id(conn, stable_id)
             raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found for LoRA '{stable_id}'.")
+        layout = existing["block_layout"]
 
         profile_name = body.get("profile_name")
         if profile_name is not None:
             profile_name = profile_name.strip()
             if not profile_name:
                 raise HTTPException(status_code=400, detail="profile_name must be non-empty if provided.")
-        else:
-            profile_name = existing["profile_name"]
 
+        packed_weights: Optional[bytes] = None
         block_weights = body.get("block_weights")
         if block_weights is not None:
-            if not isinstance(block_weights, list):
-                raise HTTPException(status_code=400, detail="block_weights must be an array of floats.")
-            try:
-                block_weights = [float(w) for w in block_weights]
-            except (TypeError, ValueError):
-                raise HTTPException(status_code=400, detail="All block_weights values must be numeric.")
-
-            if layout:
-                expected = expected_block_count_for_layout(layout)
-                if expected is not None and len(block_weights) != expected:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"block_weights length {len(block_weights)} does not match expected {expected} for layout '{layout}'.",
-                    )
+            block_weights = _coerce_block_weights(block_weights)
+            _check_block_weights_length(block_weights, layout)
+            packed_weights = _pack_block_weights(block_weights)
         else:
+            # The stored weights are kept and echoed back; refuse to touch a
+            # profile whose weights cannot be read until new ones are sent.
             try:
-                block_weights = json.loads(existing["block_weights"])
-            except (json.JSONDecodeError, TypeError):
-                block_weights = []
+                _unpack_block_weights(existing["block_weights"])
+            except (ValueError, TypeError) as exc:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Stored block_weights of profile {profile_id} are unreadable ({exc}); send block_weights to replace them.",
+                )
 
+        # Omitted fields keep their stored values (COALESCE); the response is
+        # built from what the UPDATE actually wrote.
         now = _now_iso()
         cur.execute(
             """
-            UPDATE lora_user_profiles SET profile_name = ?, block_weights = ?, updated_at = ?
-            WHERE id = ? AND stable_id = ?;
+            UPDATE lora_user_profiles
+            SET profile_name = COALESCE(?, profile_name),
+                block_weights = COALESCE(?, block_weights),
+                updated_at = ?
+            WHERE id = ? AND stable_id = ?
+            RETURNING profile_name, block_weights, created_at, updated_at;
             """,
-            (profile_name, json.dumps(block_weights), now, profile_id, stable_id),
+            (profile_name, packed_weights, now, profile_id, stable_id),
         )
+        updated = cur.fetchone()
         conn.commit()
 
+        if block_weights is None:
+            block_weights = _unpack_block_weights(updated["block_weights"])
+
         return {
             "id": profile_id,
-            "profile_name": profile_name,
+            "profile_name": updated["profile_name"],
             "block_weights": block_weights,
-            "created_at": existing["created_at"] if "created_at" in existing.keys() else now,
-            "updated_at": now,
+            "created_at": updated["created_at"],
+            "updated_at": updated["updated_at"],
         }
-    finally:
-        conn.close()
 
 
 @app.delete("/api/lora/{stable_id}/profiles/{profile_id}")
 def api_lora_profiles_delete(stable_id: str, profile_id: int):
     """Delete a user override profile."""
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
         cur = conn.cursor()
         cur.execute(
             "SELECT id FROM lora_user_profiles WHERE id = ? AND stable_id = ?;",
@@ -1819,23 +2702,47 @@ def api_lora_profiles_delete(stable_id: str, profile_id: int):
         conn.commit()
 
         return {"status": "ok"}
-    finally:
-        conn.close()
 
 
 # ----------------------------------------------------------------------
 # /api/lora/{stable_id}/export â€“ CSV export (Phase 5.1)
 # ----------------------------------------------------------------------
 
+# Block rows formatted per chunk written to the socket by the CSV export.
+EXPORT_STREAM_BATCH_ROWS = 256
+
+
+def _stream_blocks_csv(lora_id: int) -> Iterator[str]:
+    """Emit the block-weights CSV while rows are still being read from the cursor."""
+    # Every field is an int, a fixed-point number or empty, so nothing ever
+    # needs quoting; rows are formatted directly, with csv.writer's "\r\n".
+    yield "block_index,weight,raw_strength\r\n"
+
+    with get_db_connection() as conn, closing(conn.cursor()) as cur:
+        cur.row_factory = None
+        cur.execute(
+            """
+            SELECT block_index, weight, raw_strength
+            FROM lora_block_weights
+            WHERE lora_id = ?
+            ORDER BY block_index ASC;
+            """,
+            (lora_id,),
+        )
+        while True:
+            rows = cur.fetchmany(EXPORT_STREAM_BATCH_ROWS)
+            if not rows:
+                break
+            yield "".join(
+                f"{block_index},{float(weight):.6f},{'' if raw_strength is None else f'{float(raw_strength):.6f}'}\r\n"
+                for block_index, weight, raw_strength in rows
+            )
+
+
 @app.get("/api/lora/{stable_id}/export")
 def api_lora_export_csv(stable_id: str):
     """Export block weights as a CSV file."""
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
-
-    try:
+    with _api_db_connection() as conn:
         cur = conn.cursor()
         cur.execute("SELECT id, has_block_weights, block_layout FROM lora WHERE stable_id = ?;", (stable_id,))
         row = cur.fetchone()
@@ -1848,36 +2755,12 @@ def api_lora_export_csv(stable_id: str):
         if not has_blocks:
             raise HTTPException(status_code=404, detail=f"LoRA '{stable_id}' has no extracted block weights to export.")
 
-        cur.execute(
-            """
-            SELECT block_index, weight, raw_strength
-            FROM lora_block_weights
-            WHERE lora_id = ?
-            ORDER BY block_index ASC;
-            """,
-            (lora_id,),
-        )
-        blocks = cur.fetchall()
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["block_index", "weight", "raw_strength"])
-        for b in blocks:
-            writer.writerow([
-                b["block_index"],
-                f"{float(b['weight']):.6f}",
-                f"{float(b['raw_strength']):.6f}" if b["raw_strength"] is not None else "",
-            ])
-
-        output.seek(0)
-        filename = f"{stable_id}_blocks.csv"
-        return StreamingResponse(
-            output,
-            media_type="text/csv",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
-    finally:
-        conn.close()
+    filename = f"{stable_id}_blocks.csv"
+    return StreamingResponse(
+        _stream_blocks_csv(lora_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # ----------------------------------------------------------------------
@@ -1905,90 +2788,125 @@ def api_inspect_lora(path: str, base_model_code: Optional[str] = None):
 # Entrypoint
 # ----------------------------------------------------------------------
 
+def _reindex_one(stable_id: str) -> Dict[str, Any]:
+    """
+    Body of /api/lora/reindex_one: analyse the file and persist it.
+
+    _persist_analysis_for_lora writes the lora UPDATE and the block rows
+    inside one savepoint, i.e. a single transaction / commit.
+    """
+    with _api_db_connection() as conn:
+        try:
+            cur = conn.cursor()
+
+            # Fetch LoRA row
+            cur.execute(
+                """
+                SELECT id, stable_id, file_path, base_model_code, lora_type, block_layout, last_modified
+                FROM lora
+                WHERE stable_id = ?;
+                """,
+                (stable_id,),
+            )
+            row = cur.fetchone()
+
+            if row is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No LoRA found with stable_id '{stable_id}'",
+                )
+
+            result = _persist_analysis_for_lora(conn, row)
+            return {"status": "ok", **result}
+
+        except FileNotFoundError as exc:
+            raise HTTPException(status_code=404, detail=str(exc))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+
 @app.post("/api/lora/reindex_one/{stable_id}")
 async def api_reindex_one(stable_id: str):
     """
     Reindex a SINGLE LoRA by stable_id.
+
+    File inspection and the DB writes run in a worker thread, so the event
+    loop keeps serving other requests meanwhile.
     """
+    return await run_in_threadpool(_reindex_one, stable_id)
 
-    try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
 
-    try:
-        cur = conn.cursor()
+# Failures reported by the UNet 57 reindex status (the rest are only counted).
+UNET57_REPORTED_FAILURES = 25
 
-        # Fetch LoRA row
-        cur.execute(
-            """
-            SELECT id, stable_id, file_path, base_model_code, lora_type, block_layout, last_modified
-            FROM lora
-            WHERE stable_id = ?;
-            """,
-            (stable_id,),
-        )
-        row = cur.fetchone()
 
-        if row is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No LoRA found with stable_id '{stable_id}'",
-            )
+def _set_unet57_status(**changes: Any) -> None:
+    with _index_status_lock:
+        _index_status["unet57_reindex"] = {**_index_status["unet57_reindex"], **changes}
 
-        result = _persist_analysis_for_lora(conn, row)
-        return {"status": "ok", **result}
 
-    except FileNotFoundError as exc:
-        raise HTTPException(status_code=404, detail=str(exc))
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc))
+def _failure_entries(failures: List[Tuple[sqlite3.Row, Exception]]) -> List[Dict[str, str]]:
+    return [
+        {"stable_id": row["stable_id"], "error": str(exc)}
+        for row, exc in failures[:UNET57_REPORTED_FAILURES]
+    ]
 
-    finally:
-        conn.close()
 
+def _run_reindex_unet57(limit: int) -> None:
+    """
+    Background body of /api/lora/reindex_unet57.
 
-@app.post("/api/lora/reindex_unet57")
-async def api_reindex_unet57(limit: int = Query(default=0, ge=0, le=50000)):
-    """Bulk reindex rows that qualify for UNet 57 extraction."""
+    Progress lands in _index_status["unet57_reindex"] after every committed
+    batch; the caller has already set running=True.
+    """
     try:
-        conn = get_db_connection()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB open failed: {e}")
+        with get_db_connection() as conn:
+            candidates = _select_unet57_candidates(conn, limit)
+            _set_unet57_status(candidates=len(candidates))
+
+            def on_batch(processed: int, failures: List[Tuple[sqlite3.Row, Exception]]) -> None:
+                _set_unet57_status(
+                    processed=processed,
+                    failed=len(failures),
+                    failures=_failure_entries(failures),
+                )
 
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, stable_id, file_path, base_model_code, lora_type, block_layout
-            FROM lora
-            WHERE stable_id IS NOT NULL
-            ORDER BY id ASC
-            """
-        )
-        rows = cur.fetchall()
-        candidates = [row for row in rows if _is_unet57_candidate_row(row)]
-        if limit > 0:
-            candidates = candidates[:limit]
+            _persist_analyses(conn, candidates, on_batch)
+    except Exception as exc:
+        print(f"[reindex_unet57] ERROR: {exc}")
+        _set_unet57_status(running=False, finished_at=_now_iso(), error=str(exc))
+        return
 
-        processed = 0
-        failures: List[Dict[str, str]] = []
-        for row in candidates:
-            try:
-                _persist_analysis_for_lora(conn, row)
-                processed += 1
-            except Exception as exc:
-                failures.append({"stable_id": row["stable_id"], "error": str(exc)})
+    _set_unet57_status(running=False, finished_at=_now_iso())
 
-        return {
-            "status": "ok",
-            "candidates": len(candidates),
-            "processed": processed,
-            "failed": len(failures),
-            "failures": failures[:25],
+
+@app.post("/api/lora/reindex_unet57", status_code=202)
+async def api_reindex_unet57(
+    background_tasks: BackgroundTasks,
+    limit: int = Query(default=0, ge=0, le=50000),
+):
+    """
+    Queue a bulk reindex of rows that qualify for UNet 57 extraction.
+
+    Returns immediately; poll /api/lora/index_status ("unet57_reindex") for
+    candidates / processed / failed counts.
+    """
+    with _index_status_lock:
+        if _index_status["unet57_reindex"]["running"]:
+            return {"status": "already_running", "message": "UNet 57 reindex is already in progress."}
+        _index_status["unet57_reindex"] = {
+            "running": True,
+            "candidates": 0,
+            "processed": 0,
+            "failed": 0,
+            "failures": [],
+            "started_at": _now_iso(),
+            "finished_at": None,
+            "error": None,
         }
-    finally:
-        conn.close()
+
+    background_tasks.add_task(_run_reindex_unet57, limit)
+    return {"status": "queued", "limit": limit}
 
 if __name__ == "__main__":
     import uvicorn
@@ -17,7 +17,7 @@ SOFTENING_PASSES_PER_PAIR_BLOCK = 4
 OVERLAP_EPSILON = 1e-6
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoraBlockOrchestratorInput:
     stable_id: str
     filename: Optional[str]
@@ -31,7 +31,7 @@ class LoraBlockOrchestratorInput:
     block_weights: List[float]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoraBlockOrchestratorOutput:
     stable_id: str
     filename: Optional[str]
@@ -53,7 +53,7 @@ PairAdjustmentCandidate = Tuple[str, Tuple[int, ...], float, float, List[float]]
 WorstPair = Tuple[float, LoraBlockOrchestratorInput, LoraBlockOrchestratorInput]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PairAdjustment:
     target_id: str
     peer_id: str
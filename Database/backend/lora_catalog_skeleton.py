@@ -1,5 +1,5 @@
 import os
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Optional, List, Dict, Tuple
 
 
@@ -33,7 +33,7 @@ CATEGORY_INDEX_MAP: Dict[str, Tuple[str, str]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class LoraRecord:
     file_path: str
     filename: str
@@ -191,7 +191,6 @@ def main():
     max_preview = 20  # adjust if you want more/less
     for i, path in enumerate(sorted(lora_paths)):
         record = build_lora_record(path, root_dir)
-        rec_dict = asdict(record)
 
         print(f"[{i+1}] {record.filename}")
         print(f"    Path: {record.file_path}")
@@ -56,11 +56,21 @@ def validate_compatibility(loras: List[LoRAComposeInput]) -> Dict[str, Any]:
             "validated_layout": None,
         }
 
-    base_models = {(l.base_model_code or "").upper() for l in loras}
-    layouts = {(l.block_layout or "").lower() for l in loras}
+    first_base = (loras[0].base_model_code or "").upper()
+    first_layout = (loras[0].block_layout or "").lower()
+    base_ok = True
+    layout_ok = True
+    # One pass, stopping once both fields are known to disagree.
+    for l in loras[1:]:
+        if base_ok and (l.base_model_code or "").upper() != first_base:
+            base_ok = False
+        if layout_ok and (l.block_layout or "").lower() != first_layout:
+            layout_ok = False
+        if not (base_ok or layout_ok):
+            break
     stable_ids = [l.stable_id for l in loras]
 
-    if len(base_models) != 1:
+    if not base_ok:
         reasons.append(
             {
                 "code": "base_model_mismatch",
@@ -68,7 +78,7 @@ def validate_compatibility(loras: List[LoRAComposeInput]) -> Dict[str, Any]:
                 "stable_ids": stable_ids,
             }
         )
-    if len(layouts) != 1:
+    if not layout_ok:
         reasons.append(
             {
                 "code": "layout_mismatch",
@@ -79,8 +89,8 @@ def validate_compatibility(loras: List[LoRAComposeInput]) -> Dict[str, Any]:
 
     compatible = len(reasons) == 0
     if compatible:
-        validated_base_model = next(iter(base_models)) or None
-        validated_layout = next(iter(layouts)) or None
+        validated_base_model = first_base or None
+        validated_layout = first_layout or None
     else:
         validated_base_model = None
         validated_layout = None
@@ -104,11 +114,9 @@ def _combine_by_strength(
     if denominator == 0:
         return [0.0] * expected_len
 
-    combined: List[float] = []
-    for idx in range(expected_len):
-        numerator = sum(weights[idx] * strength for weights, strength in weighted_inputs)
-        combined.append(numerator / denominator)
-    return combined
+    # Column sums add the LoRAs in input order, matching a per-block loop exactly.
+    scaled_rows = [[w * strength for w in weights] for weights, strength in weighted_inputs]
+    return [sum(column) / denominator for column in zip(*scaled_rows)]
 
 
 def combine_weights_weighted_average(
@@ -35,7 +35,7 @@ ROLE_CANONICAL_MAP: Dict[str, str] = {
 OVERLAP_THRESHOLD = 0.85
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoRAEnergyInput:
     stable_id: str
     role: str
@@ -43,7 +43,7 @@ class LoRAEnergyInput:
     raw_strength_factor: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoRAEnergyMetrics:
     stable_id: str
     role: str
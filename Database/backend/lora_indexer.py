@@ -1,7 +1,9 @@
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List, Dict, Tuple
 
 from block_layouts import FLUX_FALLBACK_16, make_flux_layout, normalize_block_layout
@@ -15,6 +17,11 @@ from safetensors import safe_open
 LORA_ROOT = r"E:\models\loras"
 DB_PATH = r"E:\LoRA Project\Database\lora_master.db"
 
+# Files inspected concurrently (safetensors key scan + delta analysis), here
+# and in the API's bulk reindex. Their block norms all run on the engine's one
+# shared pool, so this only bounds how many files are open at once.
+INSPECT_WORKERS = min(4, os.cpu_count() or 1)
+
 # --- MAPPINGS (same as catalog skeleton) --- #
 
 BASE_MODEL_MAP: Dict[str, Tuple[str, str]] = {
@@ -45,7 +52,8 @@ CATEGORY_INDEX_MAP: Dict[str, Tuple[str, str]] = {
 
 # --- DATA STRUCTURES --- #
 
-@dataclass
+# slots: one record is kept per changed file until the write pass.
+@dataclass(slots=True)
 class LoraRecord:
     file_path: str
     filename: str
@@ -72,14 +80,23 @@ def normalise_path(path: str) -> str:
     return os.path.abspath(os.path.normpath(path))
 
 
+@lru_cache(maxsize=8)
+def _root_prefix(root_dir: str) -> str:
+    # Normalised once per root rather than once per file.
+    return os.path.join(normalise_path(root_dir), "")
+
+
 def parse_base_and_category(file_path: str, root_dir: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
-    root_dir = normalise_path(root_dir)
+    root_prefix = _root_prefix(root_dir)
     file_path_norm = normalise_path(file_path)
 
-    try:
-        rel_path = os.path.relpath(file_path_norm, root_dir)
-    except ValueError:
-        return None, None, None, None
+    if file_path_norm.startswith(root_prefix):
+        rel_path = file_path_norm[len(root_prefix):]
+    else:
+        try:
+            rel_path = os.path.relpath(file_path_norm, root_prefix)
+        except ValueError:
+            return None, None, None, None
 
     parts = rel_path.split(os.sep)
     # Typical:
@@ -113,7 +130,7 @@ def parse_base_and_category(file_path: str, root_dir: str) -> Tuple[Optional[str
     category_code = None
     category_name = None
 
-    first_token = category_folder.split(" ")[0].strip()
+    first_token = category_folder.partition(" ")[0].strip()
     if first_token in CATEGORY_INDEX_MAP:
         cat_short, cat_name = CATEGORY_INDEX_MAP[first_token]
         category_code = cat_short
@@ -123,15 +140,33 @@ def parse_base_and_category(file_path: str, root_dir: str) -> Tuple[Optional[str
 
     return base_model_name, base_model_code, category_name, category_code
 
-def find_lora_files(root_dir: str) -> List[str]:
-    root_dir = normalise_path(root_dir)
-    results: List[str] = []
+def _scan_lora_dir(dirpath: str, results: List[str]) -> None:
+    # Same traversal as os.walk(): unreadable folders are skipped and
+    # symlinked folders are not descended into.
+    try:
+        entries = list(os.scandir(dirpath))
+    except OSError:
+        return
+
+    subdirs: List[str] = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            if not entry.is_symlink():
+                subdirs.append(entry.path)
+        elif entry.name[-12:].lower() == ".safetensors":
+            results.append(entry.path)
 
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for name in filenames:
-            if name.lower().endswith(".safetensors"):
-                results.append(os.path.join(dirpath, name))
+    for subdir in subdirs:
+        _scan_lora_dir(subdir, results)
 
+
+def find_lora_files(root_dir: str) -> List[str]:
+    results: List[str] = []
+    _scan_lora_dir(normalise_path(root_dir), results)
     return results
 
 
@@ -361,6 +396,31 @@ def replace_block_weights(
 
 # --- MAIN INDEXING LOGIC --- #
 
+def inspect_file(
+    file_path: str, base_model_code: Optional[str]
+) -> Tuple[Optional[Tuple[bool, int]], Optional[Exception], Optional[dict], Optional[Exception]]:
+    """
+    Per-file work that needs no DB access, so it can run on a worker thread.
+
+    Returns (clip_result, clip_error, analysis, analysis_error). Analysis only
+    runs for Flux / Flux Krea and only when the clip key scan succeeded.
+    """
+    try:
+        with safe_open(file_path, framework="pt") as safetensors_file:
+            tensor_keys = list(safetensors_file.keys())
+        clip_result = is_clip_contributor(tensor_keys)
+    except Exception as e:
+        return None, e, None, None
+
+    if base_model_code not in ("FLX", "FLK"):
+        return clip_result, None, None, None
+
+    try:
+        return clip_result, None, inspect_lora(file_path, base_model_code=base_model_code), None
+    except Exception as e:
+        return clip_result, None, None, e
+
+
 def main():
     print("=== LoRA Indexer v0.1 ===")
     print(f"Root directory : {LORA_ROOT}")
@@ -388,6 +448,8 @@ def main():
     flux_with_weights = 0
     flux_sdxl_style = 0
 
+    # Pass 1: skip unchanged files; collect the rest for inspection.
+    changed: List[LoraRecord] = []
     for idx, path in enumerate(sorted(all_files)):
         file_path = normalise_path(path)
         filename = os.path.basename(file_path)
@@ -444,87 +506,98 @@ def main():
             last_modified=mtime,
         )
 
-        try:
-            with safe_open(rec.file_path, framework="pt") as safetensors_file:
-                tensor_keys = list(safetensors_file.keys())
-            rec.clip_contributor, rec.clip_tensor_count = is_clip_contributor(tensor_keys)
-        except Exception as e:
-            errors += 1
-            print(f"[ERROR] {file_path}")
-            print(f"        Failed to inspect safetensors keys for clip contribution: {e}")
-            continue
-
-        # Run analysis only for Flux / Flux Krea (for now)
-        try:
-            if rec.base_model_code in ("FLX", "FLK"):
-                analysis = inspect_lora(rec.file_path, base_model_code=rec.base_model_code)
-                rec.model_family = analysis.get("model_family")
-                rec.lora_type = analysis.get("lora_type")
-                rec.rank = analysis.get("rank")
-                block_weights = analysis.get("block_weights") or []
-                raw_strengths = analysis.get("raw_block_strengths") or []
-
-                if block_weights:
-                    rec.has_block_weights = True
-                    inferred_layout = make_flux_layout(rec.lora_type, len(block_weights))
-                    normalized_layout = normalize_block_layout(inferred_layout)
-
-                    if normalized_layout is None:
-                        fallback_dynamic = normalize_block_layout(
-                            f"flux_transformer_{len(block_weights)}"
-                        )
-                        normalized_layout = fallback_dynamic
+        changed.append(rec)
+
+    # Pass 2: inspect changed files on worker threads. Results come back in
+    # file order and every DB write stays on this thread.
+    with ThreadPoolExecutor(max_workers=INSPECT_WORKERS) as executor:
+        inspections = executor.map(
+            inspect_file,
+            [rec.file_path for rec in changed],
+            [rec.base_model_code for rec in changed],
+        )
+        for rec, (clip_result, clip_error, analysis, analysis_error) in zip(changed, inspections):
+            file_path = rec.file_path
 
-                    rec.block_layout = normalized_layout
-                    flux_with_weights += 1
+            if clip_error is not None:
+                errors += 1
+                print(f"[ERROR] {file_path}")
+                print(f"        Failed to inspect safetensors keys for clip contribution: {clip_error}")
+                continue
+            rec.clip_contributor, rec.clip_tensor_count = clip_result
+
+            # Run analysis only for Flux / Flux Krea (for now)
+            try:
+                if rec.base_model_code in ("FLX", "FLK"):
+                    if analysis_error is not None:
+                        raise analysis_error
+                    rec.model_family = analysis.get("model_family")
+                    rec.lora_type = analysis.get("lora_type")
+                    rec.rank = analysis.get("rank")
+                    block_weights = analysis.get("block_weights") or []
+                    raw_strengths = analysis.get("raw_block_strengths") or []
+
+                    if block_weights:
+                        rec.has_block_weights = True
+                        inferred_layout = make_flux_layout(rec.lora_type, len(block_weights))
+                        normalized_layout = normalize_block_layout(inferred_layout)
+
+                        if normalized_layout is None:
+                            fallback_dynamic = normalize_block_layout(
+                                f"flux_transformer_{len(block_weights)}"
+                            )
+                            normalized_layout = fallback_dynamic
+
+                        rec.block_layout = normalized_layout
+                        flux_with_weights += 1
+                    else:
+                        rec.has_block_weights = False
+                        rec.block_layout = FLUX_FALLBACK_16
+                        flux_sdxl_style += 1
                 else:
+                    # For non-Flux base models, just store metadata for now
+                    rec.model_family = None
+                    rec.lora_type = None
+                    rec.rank = None
                     rec.has_block_weights = False
-                    rec.block_layout = FLUX_FALLBACK_16
-                    flux_sdxl_style += 1
-            else:
-                # For non-Flux base models, just store metadata for now
-                rec.model_family = None
-                rec.lora_type = None
-                rec.rank = None
-                rec.has_block_weights = False
-                rec.block_layout = None
+                    rec.block_layout = None
+                    block_weights = []
+                    raw_strengths = []
+
+            except Exception as e:
+                errors += 1
+                print(f"[ERROR] {file_path}")
+                print(f"        {e}")
                 block_weights = []
                 raw_strengths = []
+                rec.has_block_weights = False
+                rec.block_layout = None
 
-        except Exception as e:
-            errors += 1
-            print(f"[ERROR] {file_path}")
-            print(f"        {e}")
-            block_weights = []
-            raw_strengths = []
-            rec.has_block_weights = False
-            rec.block_layout = None
-
-        # Insert/update row
-        lora_id = upsert_lora(cur, rec)
-
-        # Store block weights if any
-        if rec.has_block_weights and block_weights:
-            stable_id = None
-            try:
-                cur.execute("SELECT stable_id FROM lora WHERE id = ?", (lora_id,))
-                stable_row = cur.fetchone()
-                if stable_row is not None:
-                    stable_id = stable_row[0]
-            except sqlite3.OperationalError as e:
-                # Fresh/legacy DBs may not have lora.stable_id yet
-                if "no such column" not in str(e).lower():
-                    raise
-            replace_block_weights(cur, lora_id, stable_id, block_weights, raw_strengths)
-
-        processed += 1
-
-        # Light progress feedback every 50 files
-        if processed % 50 == 0:
-            print(
-                f"Processed {processed}/{len(all_files)} "
-                f"(skipped unchanged: {skipped_unchanged}, errors: {errors})"
-            )
+            # Insert/update row
+            lora_id = upsert_lora(cur, rec)
+
+            # Store block weights if any
+            if rec.has_block_weights and block_weights:
+                stable_id = None
+                try:
+                    cur.execute("SELECT stable_id FROM lora WHERE id = ?", (lora_id,))
+                    stable_row = cur.fetchone()
+                    if stable_row is not None:
+                        stable_id = stable_row[0]
+                except sqlite3.OperationalError as e:
+                    # Fresh/legacy DBs may not have lora.stable_id yet
+                    if "no such column" not in str(e).lower():
+                        raise
+                replace_block_weights(cur, lora_id, stable_id, block_weights, raw_strengths)
+
+            processed += 1
+
+            # Light progress feedback every 50 files
+            if processed % 50 == 0:
+                print(
+                    f"Processed {processed}/{len(all_files)} "
+                    f"(skipped unchanged: {skipped_unchanged}, errors: {errors})"
+                )
 
     conn.commit()
     conn.close()
@@ -5,44 +5,27 @@ import sqlite3
 from pathlib import Path
 from typing import List, Dict
 
-from lora_api_server import get_db_connection, _is_unet57_candidate_row, _persist_analysis_for_lora
+from lora_api_server import (
+    get_db_connection,
+    _persist_analyses,
+    _persist_analysis_for_lora,
+    _select_unet57_candidates,
+)
 
 
 def reindex_bulk(limit: int = 0) -> Dict[str, int]:
-    conn = get_db_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, stable_id, file_path, base_model_code, lora_type, block_layout
-            FROM lora
-            WHERE stable_id IS NOT NULL
-            ORDER BY id ASC
-            """
-        )
-        rows = cur.fetchall()
-        candidates = [row for row in rows if _is_unet57_candidate_row(row)]
-        if limit > 0:
-            candidates = candidates[:limit]
+    with get_db_connection() as conn:
+        candidates = _select_unet57_candidates(conn, limit)
 
-        processed = 0
-        failed = 0
-        for row in candidates:
-            try:
-                _persist_analysis_for_lora(conn, row)
-                processed += 1
-            except Exception as exc:
-                failed += 1
-                print(f"[FAIL] {row['stable_id']}: {exc}")
+        processed, failures = _persist_analyses(conn, candidates)
+        for row, exc in failures:
+            print(f"[FAIL] {row['stable_id']}: {exc}")
 
-        return {"candidates": len(candidates), "processed": processed, "failed": failed}
-    finally:
-        conn.close()
+        return {"candidates": len(candidates), "processed": processed, "failed": len(failures)}
 
 
 def reindex_single(stable_id: str) -> None:
-    conn = get_db_connection()
-    try:
+    with get_db_connection() as conn:
         cur = conn.cursor()
         cur.execute(
             """
@@ -56,8 +39,6 @@ def reindex_single(stable_id: str) -> None:
             raise SystemExit(f"No LoRA found with stable_id={stable_id}")
         _persist_analysis_for_lora(conn, row)
         print(f"[OK] Reindexed {stable_id}")
-    finally:
-        conn.close()
 
 
 def main() -> int:
@@ -0,0 +1,90 @@
+from pathlib import Path
+import sqlite3
+import sys
+import types
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+try:
+    import delta_inspector_engine  # noqa: F401
+except ImportError:
+    # torch is not needed by the API tests; they never run an analysis.
+    sys.modules["delta_inspector_engine"] = types.SimpleNamespace(inspect_lora=lambda *args, **kwargs: None)
+import lora_api_server  # noqa: E402
+
+
+# Same columns as lora_indexer.ensure_db(), with the NOT NULLs that tests
+# do not care about relaxed so rows can be inserted sparsely.
+API_TEST_SCHEMA = """
+CREATE TABLE lora (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stable_id TEXT,
+    file_path TEXT,
+    filename TEXT,
+    base_model_name TEXT,
+    base_model_code TEXT,
+    category_name TEXT,
+    category_code TEXT,
+    model_family TEXT,
+    lora_type TEXT,
+    rank INTEGER,
+    has_block_weights INTEGER NOT NULL DEFAULT 0,
+    block_layout TEXT,
+    clip_contributor INTEGER NOT NULL DEFAULT 0,
+    clip_tensor_count INTEGER NOT NULL DEFAULT -1,
+    last_modified REAL,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE lora_block_weights (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    lora_id INTEGER NOT NULL,
+    stable_id TEXT,
+    block_index INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    raw_strength REAL
+);
+"""
+
+
+def _close_pooled_connections() -> None:
+    with lora_api_server._pool_lock:
+        lora_api_server._drain_pool()
+
+
+@pytest.fixture
+def api_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    A fresh lora_master.db for lora_api_server, not yet migrated.
+
+    DB_PATH points at it and the module-level state that outlives a request
+    (migration flags, search cache, pooled connections) starts clean and is
+    cleared again afterwards.
+    """
+    db_path = tmp_path / "lora_master.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(API_TEST_SCHEMA)
+    conn.close()
+
+    monkeypatch.setattr(lora_api_server, "DB_PATH", db_path)
+    monkeypatch.setattr(lora_api_server, "_schema_migrations_done", False)
+    monkeypatch.setattr(lora_api_server, "_lora_columns", ())
+    monkeypatch.setattr(lora_api_server, "_lora_fts_ready", False)
+    monkeypatch.setattr(lora_api_server, "_lora_generation_ready", False)
+    lora_api_server.clear_search_cache()
+    _close_pooled_connections()
+
+    yield db_path
+
+    lora_api_server.clear_search_cache()
+    _close_pooled_connections()
+
+
+@pytest.fixture
+def api_client(api_db: Path):
+    from fastapi.testclient import TestClient
+
+    with TestClient(lora_api_server.app) as client:
+        yield client
@@ -0,0 +1,89 @@
+from contextlib import closing
+import sqlite3
+
+import pytest
+
+import lora_api_server
+
+
+@pytest.fixture
+def db_path(api_db):
+    conn = sqlite3.connect(api_db)
+    conn.executemany("INSERT INTO lora (filename) VALUES (?);", [(f"lora_{i:04d}",) for i in range(100)])
+    conn.commit()
+    conn.close()
+    return api_db
+
+
+def test_pool_reuses_connections_for_the_same_db(db_path):
+    with lora_api_server.get_db_connection() as first:
+        pass
+    with lora_api_server.get_db_connection() as second:
+        assert second is first
+    assert lora_api_server.pool_stats()["in_use"] == 0
+
+
+def test_abandoned_search_stream_does_not_pin_a_stale_snapshot(db_path, monkeypatch):
+    monkeypatch.setattr(lora_api_server, "SEARCH_STREAM_BATCH_ROWS", 10)
+    # Keep every cursor the stream opens alive past its close, as a lingering
+    # reference elsewhere would.
+    cursors = []
+
+    def keep_alive(cursor):
+        cursors.append(cursor)
+        return closing(cursor)
+
+    monkeypatch.setattr(lora_api_server, "closing", keep_alive)
+    count_sql, page_sql = lora_api_server._search_sql(False, False, False, False)
+
+    stream = lora_api_server._search_snapshot(count_sql, page_sql, [], limit=1000, offset=0)
+    next(stream)  # ETag
+    next(stream)  # body opening
+    next(stream)  # first batch of rows
+    stream.close()
+    assert len(cursors) == 1
+
+    writer = sqlite3.connect(db_path)
+    writer.execute("INSERT INTO lora (filename) VALUES ('late');")
+    writer.commit()
+    writer.close()
+
+    # The pool hands back the stream's connection (LIFO); it must read the
+    # current data, not the snapshot of the abandoned SELECT.
+    with lora_api_server.get_db_connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM lora;").fetchone()[0] == 101
+
+
+def test_pool_is_warmed_even_when_the_startup_backfill_fails(db_path, monkeypatch):
+    def locked(conn):
+        raise sqlite3.OperationalError("database is locked")
+
+    warmed = []
+    monkeypatch.setattr(lora_api_server, "_backfill_flux_layouts", locked)
+    monkeypatch.setattr(lora_api_server, "_warm_pool", lambda: warmed.append(True))
+
+    lora_api_server.on_startup_backfills()
+    assert warmed == [True]
+
+
+def test_search_reads_tag_total_and_page_from_one_snapshot(db_path):
+    count_sql, page_sql = lora_api_server._search_sql(False, False, False, False)
+    stream = lora_api_server._search_snapshot(count_sql, page_sql, [], limit=1000, offset=0)
+    etag = next(stream)
+    assert etag is not None
+
+    # A reindex commits between the tag and the page being read.
+    writer = sqlite3.connect(db_path)
+    writer.execute("INSERT INTO lora (filename) VALUES ('late');")
+    writer.commit()
+    writer.close()
+
+    body = lora_api_server._load_json(b"".join(stream))
+    assert body["total"] == body["count"] == len(body["results"]) == 100
+    assert lora_api_server.pool_stats()["in_use"] == 0
+
+    fresh = lora_api_server._search_snapshot(count_sql, page_sql, [], limit=1000, offset=0)
+    assert next(fresh) != etag
+    fresh.close()
+    assert lora_api_server.pool_stats()["in_use"] == 0
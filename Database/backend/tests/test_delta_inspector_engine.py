@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+from safetensors.torch import save_file
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import delta_inspector_engine  # noqa: E402
+from delta_inspector_engine import inspect_lora  # noqa: E402
+
+
+def _write_transformer_fixture(path: Path, scale: float = 1.0) -> None:
+    tensors = {
+        f"transformer.single_transformer_blocks.{i}.attn.to_q.lora_A.weight": torch.ones((2, 2)) * (i + 1) * scale
+        for i in range(3)
+    }
+    save_file(tensors, str(path))
+
+
+@pytest.fixture(autouse=True)
+def _clear_inspect_cache():
+    delta_inspector_engine._inspect_cached.cache_clear()
+    yield
+    delta_inspector_engine._inspect_cached.cache_clear()
+
+
+def test_transformer_fixture_is_normalised_to_strongest_block(tmp_path: Path) -> None:
+    fixture = tmp_path / "transformer.safetensors"
+    _write_transformer_fixture(fixture)
+
+    result = inspect_lora(str(fixture), base_model_code="FLX")
+
+    assert result["block_layout"] == "flux_transformer_38"
+    assert result["raw_block_strengths"] == pytest.approx([2.0, 4.0, 6.0])
+    assert result["block_weights"] == pytest.approx([0.333333, 0.666667, 1.0])
+
+
+def test_inspect_lora_reuses_analysis_until_file_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    fixture = tmp_path / "transformer.safetensors"
+    _write_transformer_fixture(fixture)
+
+    calls = []
+    real_analyse = delta_inspector_engine._analyse_flux_blocks
+
+    def _counting_analyse(path, base_model_code):
+        calls.append(path)
+        return real_analyse(path, base_model_code)
+
+    monkeypatch.setattr(delta_inspector_engine, "_analyse_flux_blocks", _counting_analyse)
+
+    first = inspect_lora(str(fixture), base_model_code="FLX")
+    first["block_weights"].append(99.0)
+    second = inspect_lora(str(fixture), base_model_code="FLX")
+
+    assert len(calls) == 1
+    assert second["block_weights"] == pytest.approx([0.333333, 0.666667, 1.0])
+
+    _write_transformer_fixture(fixture, scale=2.0)
+    stat = fixture.stat()
+    os.utime(fixture, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    third = inspect_lora(str(fixture), base_model_code="FLX")
+
+    assert len(calls) == 2
+    assert third["raw_block_strengths"] == pytest.approx([4.0, 8.0, 12.0])
@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def client(api_db, api_client):
+    conn = sqlite3.connect(api_db)
+    conn.executemany(
+        "INSERT INTO lora (stable_id, filename, base_model_code, has_block_weights, block_layout) VALUES (?, ?, ?, ?, ?);",
+        [
+            ("SDX-A-001", "a.safetensors", "SDX", 1, "unet_57"),
+            ("FLX-B-001", "b.safetensors", "FLX", 0, None),
+            ("SDX-C-001", "c.safetensors", "SDX", 1, "unet_57"),
+        ],
+    )
+    for lora_id in (1, 3):
+        # Inserted out of order; responses list blocks by block_index.
+        conn.executemany(
+            "INSERT INTO lora_block_weights (lora_id, block_index, weight, raw_strength) VALUES (?, ?, ?, ?);",
+            [(lora_id, i, (i % 7) / 7 + lora_id, None if i % 2 else i * 0.5) for i in reversed(range(57))],
+        )
+    conn.commit()
+    conn.close()
+    return api_client
+
+
+def test_blocks_batch_matches_single_blocks_in_request_order(client):
+    requested = ["SDX-C-001", "FLX-B-001", "NOPE", "SDX-A-001", "SDX-C-001"]
+    response = client.post("/api/lora/blocks_batch", json={"stable_ids": requested})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["missing"] == ["NOPE"]
+    assert [entry["stable_id"] for entry in body["results"]] == ["SDX-C-001", "FLX-B-001", "SDX-A-001"]
+    assert [len(entry["blocks"]) for entry in body["results"] if entry["has_block_weights"]] == [57, 57]
+    for entry in body["results"]:
+        assert entry == client.get(f"/api/lora/{entry['stable_id']}/blocks").json()
+
+
+def test_blocks_batch_rejects_empty_requests(client):
+    assert client.post("/api/lora/blocks_batch", json={"stable_ids": [" ", ""]}).status_code == 400
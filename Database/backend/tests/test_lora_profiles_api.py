@@ -0,0 +1,119 @@
+import json
+import sqlite3
+
+import pytest
+
+import lora_api_server
+
+
+WEIGHTS = [round(i / 7, 6) + 0.1 for i in range(57)]
+
+
+@pytest.fixture
+def client(api_db, api_client):
+    conn = sqlite3.connect(api_db)
+    conn.execute(
+        "INSERT INTO lora (stable_id, filename, base_model_code, has_block_weights, block_layout) "
+        "VALUES ('SDX-A-001', 'a.safetensors', 'SDX', 1, 'unet_57');"
+    )
+    conn.commit()
+    conn.close()
+    return api_client
+
+
+def _stored_weights(db_path, profile_id):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT block_weights FROM lora_user_profiles WHERE id = ?;", (profile_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _insert_profile(db_path, profile_name, raw_weights) -> int:
+    conn = sqlite3.connect(db_path)
+    cur = conn.execute(
+        """
+        INSERT INTO lora_user_profiles (lora_id, stable_id, profile_name, block_weights, created_at, updated_at)
+        VALUES (1, 'SDX-A-001', ?, ?, '2024-01-01T00:00:00Z', '2024-01-01T00:00:00Z');
+        """,
+        (profile_name, raw_weights),
+    )
+    conn.commit()
+    conn.close()
+    return cur.lastrowid
+
+
+def test_profile_weights_round_trip_through_the_float64_blob(client, api_db):
+    created = client.post(
+        "/api/lora/SDX-A-001/profiles",
+        json={"profile_name": " soft ", "block_weights": [1] + WEIGHTS[1:]},
+    )
+    assert created.status_code == 200
+    profile = created.json()
+    assert profile["profile_name"] == "soft"
+    assert profile["block_weights"] == [1.0] + WEIGHTS[1:]
+
+    stored = _stored_weights(api_db, profile["id"])
+    assert isinstance(stored, bytes) and len(stored) == 57 * 8
+    assert lora_api_server._unpack_block_weights(stored) == [1.0] + WEIGHTS[1:]
+
+    listed = client.get("/api/lora/SDX-A-001/profiles").json()["profiles"]
+    assert [p["block_weights"] for p in listed] == [[1.0] + WEIGHTS[1:]]
+
+    renamed = client.put(f"/api/lora/SDX-A-001/profiles/{profile['id']}", json={"profile_name": "softer"})
+    assert renamed.json()["block_weights"] == [1.0] + WEIGHTS[1:]
+
+    replaced = client.put(f"/api/lora/SDX-A-001/profiles/{profile['id']}", json={"block_weights": WEIGHTS[::-1]})
+    assert replaced.json()["profile_name"] == "softer"
+    assert client.get("/api/lora/SDX-A-001/profiles").json()["profiles"][0]["block_weights"] == WEIGHTS[::-1]
+
+    assert client.delete(f"/api/lora/SDX-A-001/profiles/{profile['id']}").json() == {"status": "ok"}
+    assert client.get("/api/lora/SDX-A-001/profiles").json()["profiles"] == []
+
+
+def test_legacy_json_profile_is_listed_and_updated(client, api_db):
+    profile_id = _insert_profile(api_db, "legacy", json.dumps(WEIGHTS))
+
+    listed = client.get("/api/lora/SDX-A-001/profiles").json()["profiles"]
+    assert listed[0]["block_weights"] == WEIGHTS
+    assert "block_weights_error" not in listed[0]
+
+    # A rename keeps the JSON text as stored.
+    renamed = client.put(f"/api/lora/SDX-A-001/profiles/{profile_id}", json={"profile_name": "legacy 2"})
+    assert renamed.status_code == 200
+    assert renamed.json()["block_weights"] == WEIGHTS
+    assert isinstance(_stored_weights(api_db, profile_id), str)
+
+    # New weights are written in the BLOB format.
+    client.put(f"/api/lora/SDX-A-001/profiles/{profile_id}", json={"block_weights": WEIGHTS[::-1]})
+    assert isinstance(_stored_weights(api_db, profile_id), bytes)
+    assert client.get("/api/lora/SDX-A-001/profiles").json()["profiles"][0]["block_weights"] == WEIGHTS[::-1]
+
+
+def test_corrupt_blob_is_reported_instead_of_failing(client, api_db):
+    good = client.post("/api/lora/SDX-A-001/profiles", json={"profile_name": "good", "block_weights": WEIGHTS}).json()
+    corrupt_id = _insert_profile(api_db, "corrupt", b"\x00" * 12)
+
+    listed = client.get("/api/lora/SDX-A-001/profiles")
+    assert listed.status_code == 200
+    by_id = {p["id"]: p for p in listed.json()["profiles"]}
+    assert by_id[good["id"]]["block_weights"] == WEIGHTS
+    assert by_id[corrupt_id]["block_weights"] == []
+    assert "12 bytes" in by_id[corrupt_id]["block_weights_error"]
+
+    renamed = client.put(f"/api/lora/SDX-A-001/profiles/{corrupt_id}", json={"profile_name": "still corrupt"})
+    assert renamed.status_code == 409
+    assert "unreadable" in renamed.json()["detail"]
+
+    repaired = client.put(f"/api/lora/SDX-A-001/profiles/{corrupt_id}", json={"block_weights": WEIGHTS})
+    assert repaired.status_code == 200
+    assert repaired.json()["profile_name"] == "corrupt"
+
+
+def test_profile_requests_are_validated(client):
+    assert client.get("/api/lora/NOPE/profiles").status_code == 404
+    assert client.post("/api/lora/SDX-A-001/profiles", json={"profile_name": "", "block_weights": WEIGHTS}).status_code == 400
+    assert client.post("/api/lora/SDX-A-001/profiles", json={"profile_name": "x", "block_weights": ["a"] * 57}).status_code == 400
+    assert client.post("/api/lora/SDX-A-001/profiles", json={"profile_name": "x", "block_weights": WEIGHTS[:10]}).status_code == 400
+    assert client.put("/api/lora/SDX-A-001/profiles/999", json={"profile_name": "x"}).status_code == 404
+    assert client.delete("/api/lora/SDX-A-001/profiles/999").status_code == 404
@@ -0,0 +1,94 @@
+import sqlite3
+
+import pytest
+
+import lora_api_server
+
+
+@pytest.fixture
+def client_with_temp_db(api_db, api_client):
+    conn = sqlite3.connect(api_db)
+    conn.execute(
+        "INSERT INTO lora (stable_id, filename, base_model_code, has_block_weights) VALUES ('SDX-A-001', 'a.safetensors', 'SDX', 0);"
+    )
+    conn.commit()
+    conn.close()
+    return api_client, api_db
+
+
+def test_search_revalidation_returns_304_until_lora_changes(client_with_temp_db):
+    client, db_path = client_with_temp_db
+
+    first = client.get("/api/lora/search", params={"base": "SDX"})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = client.get("/api/lora/search", params={"base": "SDX"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    # Different filters are a different representation.
+    other = client.get("/api/lora/search", params={"base": "FLX"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+    # Writes that leave updated_at untouched still invalidate the tag.
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE lora SET block_layout = 'unet_57' WHERE stable_id = 'SDX-A-001';")
+    conn.commit()
+    conn.close()
+
+    refreshed = client.get("/api/lora/search", params={"base": "SDX"}, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["results"][0]["block_layout"] == "unet_57"
+
+
+def test_repeated_search_is_replayed_from_the_cache(client_with_temp_db, monkeypatch):
+    client, db_path = client_with_temp_db
+
+    first = client.get("/api/lora/search", params={"search": "a.safe"})
+    assert first.status_code == 200
+
+    search_result_from_row = lora_api_server._search_result_from_row
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached search should not read the page")
+
+    monkeypatch.setattr(lora_api_server, "_search_result_from_row", fail)
+    again = client.get("/api/lora/search", params={"search": "a.safe"})
+    assert again.status_code == 200
+    assert again.content == first.content
+    assert again.headers["etag"] == first.headers["etag"]
+    monkeypatch.setattr(lora_api_server, "_search_result_from_row", search_result_from_row)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE lora SET filename = 'b.safetensors' WHERE stable_id = 'SDX-A-001';")
+    conn.commit()
+    conn.close()
+
+    after_write = client.get("/api/lora/search", params={"search": "a.safe"})
+    assert after_write.json()["total"] == 0
+
+
+def test_cached_body_belongs_to_the_generation_it_was_read_at(client_with_temp_db):
+    client, db_path = client_with_temp_db
+    count_sql, page_sql = lora_api_server._search_sql(True, False, False, False)
+    snapshot = lora_api_server._search_snapshot(count_sql, page_sql, ["SDX"], limit=50, offset=0)
+    etag = next(snapshot)
+
+    # A write lands after the tag was computed but before the page is read.
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO lora (stable_id, filename, base_model_code, has_block_weights) VALUES ('SDX-B-001', 'b.safetensors', 'SDX', 0);"
+    )
+    conn.commit()
+    conn.close()
+
+    body = b"".join(lora_api_server._caching_search_stream(etag, snapshot))
+    assert lora_api_server._load_json(body)["total"] == 1
+    assert lora_api_server._search_cache_get(etag) == body
+
+    # The stale entry is unreachable: the current generation has its own tag.
+    fresh = client.get("/api/lora/search", params={"base": "SDX"})
+    assert fresh.headers["etag"] != etag
+    assert fresh.json()["total"] == 2
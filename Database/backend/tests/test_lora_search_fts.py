@@ -0,0 +1,75 @@
+import sqlite3
+
+import lora_api_server
+
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _page_ids(conn, needle):
+    use_fts, params = lora_api_server._filename_search_params(needle)
+    _, page_sql = lora_api_server._search_sql(False, False, True, False, use_fts)
+    return [row[0] for row in conn.execute(page_sql, [*params, 1000, 0])]
+
+
+def _expected_ids(conn, needle):
+    # Literal substring ignoring ASCII case only (as LIKE does), in filename order.
+    needle = needle.translate(_ASCII_LOWER)
+    rows = conn.execute("SELECT id, filename FROM lora WHERE filename IS NOT NULL ORDER BY filename, id;")
+    return [lora_id for lora_id, filename in rows if needle in filename.translate(_ASCII_LOWER)]
+
+
+def test_filename_search_is_a_literal_substring_match_after_writes(api_db):
+    conn = sqlite3.connect(api_db)
+    # Rows written before the index exists are picked up by the initial rebuild.
+    conn.executemany(
+        "INSERT INTO lora (filename) VALUES (?);",
+        [("Flux_Portrait_v2.safetensors",), ("anime_style.safetensors",), ("x",), ("100%_fluxA.safetensors",)],
+    )
+    lora_api_server.ensure_safe_schema_migrations(conn)
+    assert lora_api_server._lora_fts_ready
+
+    # Later inserts, renames and deletes go through the triggers.
+    conn.executemany(
+        "INSERT INTO lora (filename) VALUES (?);",
+        [("FLUX_detail.safetensors",), ("wan_motion.safetensors",), (None,), ('say "hi".safetensors',)],
+    )
+    conn.execute("UPDATE lora SET filename = 'renamed_flux.safetensors' WHERE filename = 'anime_style.safetensors';")
+    conn.execute("DELETE FROM lora WHERE filename = 'wan_motion.safetensors';")
+
+    for needle in ("flux", "FLUX_", "x_", "_", "%", "0%_", "anime", "motion", "x", '"hi"', "safetensors", "nothing"):
+        assert _page_ids(conn, needle) == _expected_ids(conn, needle), needle
+    assert len(_page_ids(conn, "flux")) == 4
+    # `_` is literal: "flux_" must not match "fluxA".
+    assert len(_page_ids(conn, "flux_")) == 2
+
+
+def test_filename_search_without_fts_uses_escaped_like(api_db, monkeypatch):
+    conn = sqlite3.connect(api_db)
+    conn.executemany(
+        "INSERT INTO lora (filename) VALUES (?);",
+        [("flux_a.safetensors",), ("fluxA.safetensors",), ("50%.safetensors",)],
+    )
+    lora_api_server.ensure_safe_schema_migrations(conn)
+    monkeypatch.setattr(lora_api_server, "_lora_fts_ready", False)
+
+    for needle in ("FLUX_", "flux", "%", "0%.", "nothing"):
+        assert _page_ids(conn, needle) == _expected_ids(conn, needle), needle
+
+
+def test_non_ascii_case_is_matched_the_same_for_short_and_long_terms(api_db):
+    conn = sqlite3.connect(api_db)
+    conn.executemany(
+        "INSERT INTO lora (filename) VALUES (?);",
+        [("Émma_style.safetensors",), ("émma_x.safetensors",), ("EMMA_plain.safetensors",)],
+    )
+    lora_api_server.ensure_safe_schema_migrations(conn)
+    assert lora_api_server._lora_fts_ready
+
+    # The trigram index alone would fold É/é for 3+ character terms only.
+    for needle in ("é", "É", "ém", "émm", "ÉMM", "Émma_", "emm", "EMMA"):
+        assert _page_ids(conn, needle) == _expected_ids(conn, needle), needle
+    # é and É are different characters to LIKE: each finds only its own row.
+    assert _page_ids(conn, "émm") == [2]
+    assert _page_ids(conn, "ÉMM") == [1]
+    assert _page_ids(conn, "emm") == [3]
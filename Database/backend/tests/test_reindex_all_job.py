@@ -0,0 +1,39 @@
+import pytest
+
+import lora_api_server
+
+
+@pytest.fixture
+def client(api_client, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(lora_api_server, "assign_stable_ids", lambda: None)
+    monkeypatch.setattr(lora_api_server, "get_index_summary", lambda: {"total": 3, "with_blocks": 1, "no_blocks": 2})
+    return api_client
+
+
+def test_reindex_all_is_queued_and_reports_its_summary(client, monkeypatch):
+    monkeypatch.setattr(lora_api_server, "index_all_loras", lambda: None)
+
+    queued = client.post("/api/lora/reindex_all")
+    assert queued.status_code == 202
+    job_id = queued.json()["job_id"]
+
+    # TestClient runs background tasks before returning the response.
+    job = client.get(f"/api/lora/reindex_status/{job_id}").json()
+    assert job["status"] == "ok"
+    assert job["summary"]["total"] == 3
+    assert client.get("/api/lora/index_status").json()["indexing"] is False
+
+
+def test_failed_reindex_is_reported_on_the_job(client, monkeypatch):
+    def boom():
+        raise RuntimeError("disk unplugged")
+
+    monkeypatch.setattr(lora_api_server, "index_all_loras", boom)
+
+    job_id = client.post("/api/lora/reindex_all").json()["job_id"]
+    job = client.get(f"/api/lora/reindex_status/{job_id}").json()
+    assert job["status"] == "error"
+    assert job["error"] == "disk unplugged"
+    assert client.get("/api/lora/index_status").json()["indexing"] is False
+
+    assert client.get("/api/lora/reindex_status/unknown").status_code == 404
@@ -0,0 +1,60 @@
+import itertools
+import sqlite3
+
+import pytest
+
+import lora_api_server
+from block_layouts import normalize_block_layout
+
+
+def _python_rule(block_layout, lora_type):
+    # The candidate rule as it was applied row by row before it moved into SQL.
+    if normalize_block_layout(block_layout) in ("unet_57", "flux_unet_57"):
+        return True
+    lora_type = (lora_type or "").lower()
+    return "unet" in lora_type and "57" in lora_type
+
+
+@pytest.fixture
+def conn(api_db):
+    conn = sqlite3.connect(api_db)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+def test_sql_candidate_filter_matches_normalized_layout_rule(conn):
+    layouts = [None, "", "unet_57", " UNET_57 ", "flux_unet_57\n", "\tFlux_UNet_57", "unet_56", "flux_fallback_16", "junk"]
+    lora_types = [None, "", "UNet 57", "SDXL UNET (57 blocks)", "unet", "57", "Flux (UNet double+single blocks)"]
+
+    expected = []
+    for lora_id, (layout, lora_type) in enumerate(itertools.product(layouts, lora_types), start=1):
+        conn.execute(
+            "INSERT INTO lora (id, stable_id, lora_type, block_layout) VALUES (?, ?, ?, ?);",
+            (lora_id, f"SID-{lora_id}", lora_type, layout),
+        )
+        if _python_rule(layout, lora_type):
+            expected.append(lora_id)
+
+    got = [row["id"] for row in lora_api_server._select_unet57_candidates(conn)]
+
+    assert expected
+    assert got == expected
+
+
+def test_sql_candidate_filter_skips_rows_without_stable_id(conn):
+    conn.execute("INSERT INTO lora (id, stable_id, block_layout) VALUES (1, NULL, 'unet_57');")
+    conn.execute("INSERT INTO lora (id, stable_id, block_layout) VALUES (2, 'SDX-A-001', 'unet_57');")
+
+    assert [row["id"] for row in lora_api_server._select_unet57_candidates(conn)] == [2]
+
+
+def test_sql_candidate_filter_applies_limit_in_id_order(conn):
+    for lora_id in (3, 1, 2):
+        conn.execute(
+            "INSERT INTO lora (id, stable_id, block_layout) VALUES (?, ?, 'unet_57');",
+            (lora_id, f"SDX-A-{lora_id:03d}"),
+        )
+
+    assert [row["id"] for row in lora_api_server._select_unet57_candidates(conn, 2)] == [1, 2]
+    assert [row["id"] for row in lora_api_server._select_unet57_candidates(conn, 0)] == [1, 2, 3]